@@ -3,6 +3,7 @@ Middleware package.
 """
 
 from .auth import APIKeyMiddleware
+from .compression import CompressionMiddleware
 from .security import SecurityHeadersMiddleware
 
-__all__ = ["APIKeyMiddleware", "SecurityHeadersMiddleware"]
+__all__ = ["APIKeyMiddleware", "CompressionMiddleware", "SecurityHeadersMiddleware"]
@@ -4,18 +4,18 @@ Middleware de autenticação API Key.
 
 import secrets
 
-from fastapi import Request, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import status
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from src.core.config import get_settings
 from src.core.logging import get_logger
 
 logger = get_logger(__name__)
-security = HTTPBearer()
 
 
-class APIKeyMiddleware(BaseHTTPMiddleware):
+class APIKeyMiddleware:
     """
     Valida API Key em todas as requisições exceto rotas públicas.
     
@@ -24,67 +24,65 @@ class APIKeyMiddleware(BaseHTTPMiddleware):
     - /docs
     - /redoc
     - /openapi.json
+    
+    Middleware ASGI puro: requisições autenticadas seguem direto
+    para a aplicação, sem task extra nem buffer da resposta.
     """
     
     PUBLIC_PATHS = {"/health", "/docs", "/redoc", "/openapi.json", "/"}
     
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Processa requisição e valida API Key."""
-        settings = get_settings()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Permite rotas públicas
-        if request.url.path in self.PUBLIC_PATHS:
-            return await call_next(request)
+        settings = get_settings()
+        path = scope["path"]
         
-        # Em desenvolvimento, permite sem API Key
-        if settings.is_development:
-            return await call_next(request)
+        # Permite rotas públicas e, em desenvolvimento, tudo sem API Key
+        if path in self.PUBLIC_PATHS or settings.is_development:
+            await self.app(scope, receive, send)
+            return
         
         # Valida API Key - aceita X-API-Key ou Authorization: Bearer
-        api_key = request.headers.get("X-API-Key")
-        auth_header = request.headers.get("Authorization")
-        
-        provided_key = None
+        headers = Headers(scope=scope)
+        provided_key = headers.get("x-api-key")
         
-        if api_key:
-            provided_key = api_key
-        elif auth_header:
+        if not provided_key:
             # Formato esperado: "Bearer <api_key>"
-            try:
-                scheme, credentials = auth_header.split()
-                if scheme.lower() == "bearer":
-                    provided_key = credentials
-            except ValueError:
-                pass
+            scheme, _, credentials = headers.get("authorization", "").partition(" ")
+            if scheme.lower() == "bearer" and credentials.strip():
+                provided_key = credentials.strip()
+        
+        client = scope.get("client")
+        client_host = client[0] if client else "unknown"
         
         if not provided_key:
-            logger.warning(
-                "Requisição sem API Key",
-                path=request.url.path,
-                client=request.client.host if request.client else "unknown"
-            )
-            raise HTTPException(
+            logger.warning("Requisição sem API Key", path=path, client=client_host)
+            response = JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="API Key não fornecida. Use header 'X-API-Key' ou 'Authorization: Bearer <key>'",
+                content={
+                    "detail": "API Key não fornecida. Use header 'X-API-Key' ou 'Authorization: Bearer <key>'",
+                },
                 headers={"WWW-Authenticate": "Bearer"},
             )
+            await response(scope, receive, send)
+            return
         
         # Valida API Key (constant-time comparison previne timing attacks)
         if not secrets.compare_digest(provided_key, settings.api_key):
-            logger.warning(
-                "API Key inválida",
-                path=request.url.path,
-                client=request.client.host if request.client else "unknown"
-            )
-            raise HTTPException(
+            logger.warning("API Key inválida", path=path, client=client_host)
+            response = JSONResponse(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="API Key inválida",
+                content={"detail": "API Key inválida"},
             )
+            await response(scope, receive, send)
+            return
         
-        logger.debug(
-            "Requisição autenticada",
-            path=request.url.path,
-            method=request.method
-        )
+        logger.debug("Requisição autenticada", path=path, method=scope["method"])
         
-        return await call_next(request)
+        await self.app(scope, receive, send)
@@ -0,0 +1,123 @@
+"""
+Compression middleware.
+
+GZip apenas para respostas textuais (JSON, XML/SLD, HTML).
+Downloads binários (ZIP, PDF) já são comprimidos e seguem
+intactos, preservando Content-Length e sem custo de CPU.
+
+Downloads de arquivo (FileResponse, inclusive CSV) também passam
+direto: anunciam Accept-Ranges e podem responder 206, cujo
+Content-Range descreve os bytes não comprimidos.
+"""
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Content-Types que valem a pena comprimir
+COMPRESSIBLE_CONTENT_TYPES = (
+    "application/json",
+    "application/xml",
+    "application/vnd.ogc.sld+xml",
+    "text/",
+)
+
+
+class CompressionMiddleware:
+    """
+    Comprime com gzip respostas textuais quando o cliente aceita.
+
+    Middleware ASGI puro: o corpo é comprimido em streaming,
+    bloco a bloco, sem bufferizar a resposta inteira.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, compresslevel: int = 5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or "gzip" not in Headers(scope=scope).get("accept-encoding", ""):
+            await self.app(scope, receive, send)
+            return
+
+        responder = _GZipResponder(send, self.minimum_size, self.compresslevel)
+        await self.app(scope, receive, responder.send)
+
+
+class _GZipResponder:
+    """Estado de compressão de uma única resposta."""
+
+    def __init__(self, send: Send, minimum_size: int, compresslevel: int):
+        self._send = send
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self._start_message: Message | None = None
+        self._passthrough = False
+        # Criado só quando a resposta é comprimida
+        self._compressor: zlib._Compress | None = None
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self._passthrough = (
+                "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+                # Downloads com suporte a Range: comprimir quebraria a retomada
+                or message["status"] == 206
+                or "content-range" in headers
+                or headers.get("accept-ranges", "").lower() == "bytes"
+            )
+            if self._passthrough:
+                await self._send(message)
+            else:
+                # Adia o envio: headers dependem do tamanho do corpo
+                self._start_message = message
+            return
+
+        if message_type != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._start_message is not None:
+            start_message, self._start_message = self._start_message, None
+
+            # Corpo pequeno em uma única mensagem: não compensa comprimir
+            if not more_body and len(body) < self.minimum_size:
+                await self._send(start_message)
+                await self._send(message)
+                return
+
+            compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._compressor = compressor
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["Content-Encoding"] = "gzip"
+            headers.add_vary_header("Accept-Encoding")
+
+            data = compressor.compress(body)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                data += compressor.flush()
+                headers["Content-Length"] = str(len(data))
+
+            await self._send(start_message)
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        # Resposta já enviada sem compressão (corpo pequeno)
+        if self._compressor is None:
+            await self._send(message)
+            return
+
+        data = self._compressor.compress(body)
+        if not more_body:
+            data += self._compressor.flush()
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
@@ -2,14 +2,13 @@
 Security headers middleware.
 """
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.core.config import get_settings
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """
     Adiciona headers de segurança em todas as respostas.
     
@@ -19,26 +18,28 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - X-XSS-Protection: 1; mode=block
     - Strict-Transport-Security: max-age=31536000 (apenas HTTPS)
     - Content-Security-Policy: Configurado para permitir Swagger UI
+    
+    Middleware ASGI puro: apenas acrescenta headers à mensagem
+    de início da resposta, sem task extra nem buffer do corpo.
     """
     
     # CDNs permitidos para Swagger UI
     SWAGGER_CDN = "https://cdn.jsdelivr.net"
     FASTAPI_CDN = "https://fastapi.tiangolo.com"
     
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """Processa requisição e adiciona headers de segurança."""
-        response = await call_next(request)
+    def __init__(self, app: ASGIApp):
+        self.app = app
         
-        settings = get_settings()
-        
-        # Headers básicos (sempre)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
+        # Headers são fixos por processo: monta uma única vez
+        headers = {
+            "X-Content-Type-Options": "nosniff",
+            "X-Frame-Options": "DENY",
+            "X-XSS-Protection": "1; mode=block",
+        }
         
         # HSTS apenas em produção e HTTPS
-        if settings.is_production:
-            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        if get_settings().is_production:
+            headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
         
         # CSP configurado para permitir Swagger UI
         # - script-src: CDN do Swagger + inline para funcionamento
@@ -53,7 +54,21 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             f"font-src 'self' {self.SWAGGER_CDN}",
             "connect-src 'self'",
         ]
-        csp = "; ".join(csp_parts)
-        response.headers["Content-Security-Policy"] = csp
+        headers["Content-Security-Policy"] = "; ".join(csp_parts)
+        
+        self.security_headers = headers
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Processa requisição e adiciona headers de segurança."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in self.security_headers.items():
+                    headers[name] = value
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_with_headers)
@@ -5,9 +5,11 @@ Configura e fornece instâncias dos serviços
 usando o sistema de dependency injection do FastAPI.
 """
 
-import secrets
+import hashlib
+import hmac
+from collections.abc import Callable
 from functools import lru_cache
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated, Any, TypeVar
 
 from fastapi import Depends, HTTPException, Security, status
 from fastapi.security import APIKeyHeader
@@ -15,14 +17,35 @@ from fastapi.security import APIKeyHeader
 from src.core.config import Settings, get_settings
 from src.core.logging import get_logger
 from src.domain.interfaces import IGovBrAuthenticator, ISessionRepository, ISigefClient
-from src.infrastructure.govbr import PlaywrightGovBrAuthenticator
-from src.infrastructure.persistence import FileSessionRepository
-from src.infrastructure.sigef import HttpSigefClient
-from src.services.auth_service import AuthService
-from src.services.sigef_service import SigefService
+
+# Infraestrutura e serviços são importados dentro dos getters:
+# Playwright só é carregado quando realmente necessário (cold start)
+if TYPE_CHECKING:
+    from functools import _lru_cache_wrapper
+    
+    from src.infrastructure.car_wfs import CarWfsClient
+    from src.infrastructure.geoone_wfs import GeoOneWfsClient
+    from src.services.auth_service import AuthService
+    from src.services.car_bbox_service import CarBboxService
+    from src.services.car_consulta_service import CarConsultaService
+    from src.services.incra_bbox_service import IncraBboxService
+    from src.services.sicar_service import SicarService
+    from src.services.sigef_service import SigefService
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+# Registro dos getters singleton (limpos em reset_dependencies)
+_SINGLETONS: list["_lru_cache_wrapper[Any]"] = []
+
+
+def singleton(func: Callable[[], T]) -> "_lru_cache_wrapper[T]":
+    """Decora getter com lru_cache e registra para reset."""
+    cached = lru_cache(func)
+    _SINGLETONS.append(cached)
+    return cached
+
 
 # ============== Segurança ==============
 
@@ -30,6 +53,18 @@ logger = get_logger(__name__)
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 
+@singleton
+def get_api_key_digests() -> frozenset[bytes]:
+    """
+    Digests SHA-256 das API Keys aceitas (calculados uma vez).
+    
+    Inclui a API_KEY e os hashes de API_KEY_HASHES.
+    """
+    settings = get_settings()
+    digest = hashlib.sha256(settings.api_key.encode()).digest()
+    return settings.api_key_hash_digests | {digest}
+
+
 async def verify_api_key(
     api_key: Annotated[str | None, Security(api_key_header)] = None,
 ) -> str:
@@ -57,8 +92,10 @@ async def verify_api_key(
             detail="API Key não fornecida. Use header 'X-API-Key'",
         )
     
-    # Valida API Key (constant-time comparison previne timing attacks)
-    if not secrets.compare_digest(api_key, settings.api_key):
+    # Compara digests de tamanho fixo em tempo constante
+    # (previne timing attacks, inclusive sobre o tamanho da chave)
+    digest = hashlib.sha256(api_key.encode()).digest()
+    if not any(hmac.compare_digest(digest, valido) for valido in get_api_key_digests()):
         logger.warning("API Key inválida fornecida")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -74,29 +111,33 @@ RequireAPIKey = Annotated[str, Depends(verify_api_key)]
 
 # ============== Infraestrutura ==============
 
-@lru_cache
+@singleton
 def get_session_repository() -> ISessionRepository:
     """Retorna repositório de sessões (singleton)."""
+    from src.infrastructure.persistence import FileSessionRepository
     return FileSessionRepository()
 
 
-@lru_cache
+@singleton
 def get_govbr_authenticator() -> IGovBrAuthenticator:
     """Retorna autenticador Gov.br (singleton)."""
+    from src.infrastructure.govbr import PlaywrightGovBrAuthenticator
     return PlaywrightGovBrAuthenticator()
 
 
-@lru_cache
+@singleton
 def get_sigef_client() -> ISigefClient:
     """Retorna cliente SIGEF (singleton)."""
+    from src.infrastructure.sigef import HttpSigefClient
     return HttpSigefClient()
 
 
 # ============== Serviços ==============
 
-@lru_cache
-def get_auth_service() -> AuthService:
+@singleton
+def get_auth_service() -> "AuthService":
     """Retorna serviço de autenticação (singleton)."""
+    from src.services.auth_service import AuthService
     return AuthService(
         govbr_authenticator=get_govbr_authenticator(),
         sigef_client=get_sigef_client(),
@@ -104,9 +145,10 @@ def get_auth_service() -> AuthService:
     )
 
 
-@lru_cache
-def get_sigef_service() -> SigefService:
+@singleton
+def get_sigef_service() -> "SigefService":
     """Retorna serviço SIGEF (singleton)."""
+    from src.services.sigef_service import SigefService
     return SigefService(
         sigef_client=get_sigef_client(),
         session_repository=get_session_repository(),
@@ -114,16 +156,32 @@ def get_sigef_service() -> SigefService:
     )
 
 
+# ============== SICAR ==============
+
+@singleton
+def get_sicar_service() -> "SicarService":
+    """Retorna serviço SICAR (singleton)."""
+    from src.services.sicar_service import SicarService
+    return SicarService()
+
+
+@singleton
+def get_car_consulta_service() -> "CarConsultaService":
+    """Retorna serviço de consulta do demonstrativo CAR (singleton)."""
+    from src.services.car_consulta_service import CarConsultaService
+    return CarConsultaService()
+
+
 # ============== CAR BBox ==============
 
-@lru_cache
+@singleton
 def get_car_wfs_client() -> "CarWfsClient":
     """Retorna cliente WFS do GeoServer SICAR (singleton)."""
     from src.infrastructure.car_wfs import CarWfsClient
     return CarWfsClient()
 
 
-@lru_cache
+@singleton
 def get_car_bbox_service() -> "CarBboxService":
     """Retorna serviço de consulta CAR por BBox (singleton)."""
     from src.services.car_bbox_service import CarBboxService
@@ -132,30 +190,32 @@ def get_car_bbox_service() -> "CarBboxService":
 
 # ============== INCRA BBox (GeoOne) ==============
 
-@lru_cache
+@singleton
 def get_geoone_wfs_client() -> "GeoOneWfsClient":
     """Retorna cliente WFS do GeoOne GeoINCRA (singleton)."""
     from src.infrastructure.geoone_wfs import GeoOneWfsClient
     return GeoOneWfsClient()
 
 
-@lru_cache
+@singleton
 def get_incra_bbox_service() -> "IncraBboxService":
     """Retorna serviço de consulta INCRA por BBox (singleton)."""
     from src.services.incra_bbox_service import IncraBboxService
     return IncraBboxService(wfs_client=get_geoone_wfs_client())
 
 
+# ============== Encerramento ==============
+
+def close_http_clients() -> None:
+    """Fecha pools HTTP dos clientes já instanciados."""
+    for getter in (get_car_wfs_client, get_geoone_wfs_client, get_car_consulta_service):
+        if getter.cache_info().currsize:
+            getter().close()
+
+
 # ============== Reset (para testes) ==============
 
 def reset_dependencies() -> None:
     """Limpa cache de dependências (útil para testes)."""
-    get_session_repository.cache_clear()
-    get_govbr_authenticator.cache_clear()
-    get_sigef_client.cache_clear()
-    get_auth_service.cache_clear()
-    get_sigef_service.cache_clear()
-    get_car_wfs_client.cache_clear()
-    get_car_bbox_service.cache_clear()
-    get_geoone_wfs_client.cache_clear()
-    get_incra_bbox_service.cache_clear()
+    for getter in _SINGLETONS:
+        getter.cache_clear()
@@ -11,6 +11,7 @@ from src.api.v1.schemas import (
     BrowserLoginResponse,
     SessionInfoResponse,
 )
+from src.core.config import get_settings
 from src.core.exceptions import GovBrError, SessionExpiredError
 from src.core.logging import get_logger
 from src.infrastructure.browser_auth import BrowserAuthSession
@@ -21,6 +22,7 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="/auth", tags=["Autenticação"])
 
 
+
 @router.get(
     "/status",
     response_model=AuthStatusResponse,
@@ -55,7 +57,7 @@ async def get_auth_status(
             message="Aguardando autenticação via browser",
         )
     
-    # Verifica sessão normal
+    # Verifica sessão normal (AuthService mantém a sessão validada em cache)
     is_valid, session = await auth_service.validate_current_session()
     
     if is_valid and session:
@@ -106,7 +108,6 @@ async def browser_login(request: Request) -> BrowserLoginResponse:
     
     NÃO abre navegador no servidor, apenas retorna a URL.
     """
-    from src.core.config import get_settings
     settings = get_settings()
     
     browser_auth = BrowserAuthSession()
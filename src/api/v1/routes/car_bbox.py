@@ -5,17 +5,24 @@ Endpoint POST /api/car/bbox que consulta o WFS público do GeoServer do SICAR
 e retorna imóveis rurais dentro da área geográfica informada.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
 from src.api.v1.dependencies import RequireAPIKey, get_car_bbox_service
+from src.api.v1.schemas_bbox import BoundingBoxSchema
 from src.api.v1.schemas_car_bbox import (
-    BoundingBoxSchema,
     CarBboxErrorResponse,
     ConsultaCarBboxRequest,
     ConsultaCarBboxResponse,
     ImovelRuralSchema,
 )
+from src.core.cache import TTLCache
+from src.core.config import get_settings
 from src.core.logging import get_logger
+from src.domain.entities.car_bbox import detectar_ufs_por_bbox
 from src.services.car_bbox_service import (
     CarBboxService,
     CarBboxServiceError,
@@ -26,6 +33,20 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/car", tags=["SICAR"])
 
+# Mapeamento código de erro do serviço -> HTTP status (imutável)
+_CODIGO_HTTP_POR_ERRO: Mapping[str, int] = MappingProxyType({
+    "GEOSERVER_TIMEOUT": status.HTTP_504_GATEWAY_TIMEOUT,
+    "GEOSERVER_INDISPONIVEL": status.HTTP_502_BAD_GATEWAY,
+    "BBOX_FORA_DO_BRASIL": status.HTTP_400_BAD_REQUEST,
+})
+
+# Cache das respostas já serializadas (JSON bytes) por BBox + filtros:
+# consultas repetidas (pan/zoom no mapa) não voltam ao GeoServer
+_consulta_cache = TTLCache(
+    maxsize=512,
+    ttl=get_settings().car_bbox_cache_ttl_seconds,
+)
+
 
 @router.post(
     "/bbox",
@@ -62,7 +83,7 @@ async def consultar_car_por_bbox(
     request: ConsultaCarBboxRequest,
     _api_key: RequireAPIKey,
     service: CarBboxService = Depends(get_car_bbox_service),
-) -> ConsultaCarBboxResponse:
+) -> Response:
     """
     Consulta CARs dentro de um Bounding Box.
 
@@ -70,12 +91,38 @@ async def consultar_car_por_bbox(
     Retorna lista de imóveis rurais com código CAR, status,
     tipo, área e município.
     """
+    # Rejeita BBox fora do Brasil antes de cache/serviço (teste de retângulos)
+    bbox = request.bbox
+    ufs = detectar_ufs_por_bbox(
+        min_lon=bbox.min_lon,
+        min_lat=bbox.min_lat,
+        max_lon=bbox.max_lon,
+        max_lat=bbox.max_lat,
+    )
+    if not ufs:
+        raise HTTPException(
+            status_code=_CODIGO_HTTP_POR_ERRO["BBOX_FORA_DO_BRASIL"],
+            detail={
+                "erro": "BBOX_FORA_DO_BRASIL",
+                "mensagem": "O Bounding Box informado não intersecta nenhum estado brasileiro.",
+                "detalhes": [],
+            },
+        )
+    
+    bbox_wfs = bbox.to_wfs_string()
+    cache_key = (bbox_wfs, request.max_resultados, request.status, request.tipo_imovel)
+    
+    body = _consulta_cache.get(cache_key)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+    
     try:
         resultado = await service.consultar(
-            bbox_wfs=request.bbox.to_wfs_string(),
+            bbox_wfs=bbox_wfs,
             max_resultados=request.max_resultados,
             status=request.status,
             tipo_imovel=request.tipo_imovel,
+            ufs=ufs,
         )
     except CarBboxServiceError as e:
         codigo_http = _mapear_codigo_http(e.codigo)
@@ -93,17 +140,18 @@ async def consultar_car_por_bbox(
             },
         ) from e
 
-    return _resultado_para_response(resultado, request)
+    # Serializa direto com orjson (lista de imóveis pode ser grande);
+    # response_model permanece para documentação OpenAPI
+    response = _resultado_para_response(resultado, request)
+    body = orjson.dumps(response.model_dump(mode="json"))
+    _consulta_cache.set(cache_key, body)
+    
+    return Response(content=body, media_type="application/json")
 
 
 def _mapear_codigo_http(codigo_erro: str) -> int:
     """Mapeia código de erro do serviço para HTTP status code."""
-    mapeamento = {
-        "GEOSERVER_TIMEOUT": status.HTTP_504_GATEWAY_TIMEOUT,
-        "GEOSERVER_INDISPONIVEL": status.HTTP_502_BAD_GATEWAY,
-        "BBOX_FORA_DO_BRASIL": status.HTTP_400_BAD_REQUEST,
-    }
-    return mapeamento.get(codigo_erro, status.HTTP_502_BAD_GATEWAY)
+    return _CODIGO_HTTP_POR_ERRO.get(codigo_erro, status.HTTP_502_BAD_GATEWAY)
 
 
 def _resultado_para_response(
@@ -111,29 +159,23 @@ def _resultado_para_response(
     request: ConsultaCarBboxRequest,
 ) -> ConsultaCarBboxResponse:
     """Converte resultado do serviço para schema de response."""
+    # Dados já tipados pelo serviço (ImovelRuralResultado espelha o schema):
+    # model_construct evita revalidar cada imóvel
     imoveis_schema = [
-        ImovelRuralSchema(
-            id=im.id,
-            cod_imovel=im.cod_imovel,
-            status_imovel=im.status_imovel,
-            status_descricao=im.status_descricao,
-            tipo_imovel=im.tipo_imovel,
-            tipo_descricao=im.tipo_descricao,
-            area_hectares=im.area_hectares,
-            modulos_fiscais=im.modulos_fiscais,
-            uf=im.uf,
-            municipio=im.municipio,
-            cod_municipio_ibge=im.cod_municipio_ibge,
-            condicao=im.condicao,
-            data_criacao=im.data_criacao,
-        )
+        ImovelRuralSchema.model_construct(**vars(im))
         for im in resultado.imoveis
     ]
+    bbox = resultado.bbox_consultado
 
     return ConsultaCarBboxResponse(
         total_encontrados=resultado.total_encontrados,
         total_retornados=resultado.total_retornados,
-        bbox_consultado=BoundingBoxSchema(**resultado.bbox_consultado),
+        bbox_consultado=BoundingBoxSchema.model_construct(
+            min_lon=bbox["min_lon"],
+            min_lat=bbox["min_lat"],
+            max_lon=bbox["max_lon"],
+            max_lat=bbox["max_lat"],
+        ),
         ufs_consultadas=resultado.ufs_consultadas,
         srs=resultado.srs,
         filtros_aplicados=resultado.filtros_aplicados,
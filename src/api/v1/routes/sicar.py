@@ -4,14 +4,20 @@ Rotas SICAR - Download de shapefiles do Sistema de Cadastro Ambiental Rural.
 Endpoints para download direto de arquivos do SICAR.
 """
 
-from enum import Enum
-from typing import Annotated, Optional
-
-from fastapi import APIRouter, Depends, HTTPException, status, Response
-from fastapi.responses import StreamingResponse
+import asyncio
+import functools
+import hashlib
+import re
+from collections.abc import Callable
+from typing import Annotated, Any, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel, Field
+from starlette.types import Receive, Scope, Send
 
-from src.api.v1.dependencies import RequireAPIKey
+from src.api.v1.dependencies import RequireAPIKey, get_car_consulta_service, get_sicar_service
 from src.api.v1.schemas import (
     TemaCAR,
     GrupoCAR,
@@ -22,8 +28,16 @@ from src.api.v1.schemas import (
     PaletaCoresResponse,
     DemonstrativoCAR,
 )
+from src.core.cache import TTLCache, etag_corresponde
+from src.core.config import get_settings
 from src.core.logging import get_logger
-from src.services.sicar_service import SicarService, AVAILABLE_POLYGONS, AVAILABLE_STATES
+from src.services.sicar_service import (
+    AVAILABLE_POLYGONS,
+    AVAILABLE_STATES,
+    PolygonType,
+    SicarService,
+    StateCode,
+)
 from src.infrastructure.sicar_package.car_reference import (
     MODELO_CAR,
     buscar_tema,
@@ -31,58 +45,50 @@ from src.infrastructure.sicar_package.car_reference import (
     listar_temas_por_grupo,
     obter_paleta_cores,
 )
-from src.infrastructure.sicar_package.sld_generator import gerar_sld_por_nome
+from src.infrastructure.sicar_package.sld_generator import criar_sld_para_tema
 from src.services.car_consulta_service import CarConsultaService, CarConsultaError
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/sicar", tags=["SICAR"])
 
+# Demonstrativos CAR mudam raramente: evita nova consulta ao car.gov.br
+# (JSON guardado já serializado em bytes)
+_demonstrativo_cache = TTLCache(
+    maxsize=2048,
+    ttl=get_settings().car_consulta_cache_ttl_seconds,
+)
+_demonstrativo_pdf_cache = TTLCache(
+    maxsize=500,
+    ttl=get_settings().car_consulta_cache_ttl_seconds,
+)
+
+# Código CAR: UF-CODIGO_MUNICIPIO_IBGE-HASH (32 hex)
+_CAR_CODE_PATTERN = re.compile(r"[A-Z]{2}-\d+-[0-9A-F]{32}")
+
+# Consultas ao car.gov.br são síncronas (rodam em thread): limita quantas
+# ocupam threads/conexões ao mesmo tempo
+MAX_CONSULTAS_CAR_SIMULTANEAS = 8
+_consulta_car_limite = asyncio.Semaphore(MAX_CONSULTAS_CAR_SIMULTANEAS)
 
-# ===== Enums =====
-
-class PolygonType(str, Enum):
-    """Tipos de polígono disponíveis no SICAR."""
-    AREA_PROPERTY = "AREA_PROPERTY"
-    APPS = "APPS"
-    NATIVE_VEGETATION = "NATIVE_VEGETATION"
-    HYDROGRAPHY = "HYDROGRAPHY"
-    LEGAL_RESERVE = "LEGAL_RESERVE"
-    RESTRICTED_USE = "RESTRICTED_USE"
-    CONSOLIDATED_AREA = "CONSOLIDATED_AREA"
-    ADMINISTRATIVE_SERVICE = "ADMINISTRATIVE_SERVICE"
-    AREA_FALL = "AREA_FALL"
-
-
-class StateCode(str, Enum):
-    """Estados brasileiros."""
-    AC = "AC"
-    AL = "AL"
-    AP = "AP"
-    AM = "AM"
-    BA = "BA"
-    CE = "CE"
-    DF = "DF"
-    ES = "ES"
-    GO = "GO"
-    MA = "MA"
-    MT = "MT"
-    MS = "MS"
-    MG = "MG"
-    PA = "PA"
-    PB = "PB"
-    PR = "PR"
-    PE = "PE"
-    PI = "PI"
-    RJ = "RJ"
-    RN = "RN"
-    RS = "RS"
-    RO = "RO"
-    RR = "RR"
-    SC = "SC"
-    SP = "SP"
-    SE = "SE"
-    TO = "TO"
+
+class _StreamingResponseFinalizada(StreamingResponse):
+    """
+    StreamingResponse que executa `ao_finalizar` ao terminar o envio.
+    
+    Executado também em desconexão do cliente, caso em que o
+    BackgroundTask da resposta não roda.
+    """
+    
+    def __init__(self, *args: Any, ao_finalizar: Callable[[], None], **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._ao_finalizar = ao_finalizar
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self._ao_finalizar()
 
 
 # ===== Request Schemas =====
@@ -129,6 +135,7 @@ class CarDownloadRequest(BaseModel):
 async def stream_download_state(
     body: StateDownloadRequest,
     _api_key: RequireAPIKey,
+    service: SicarService = Depends(get_sicar_service),
 ):
     """
     Baixa um shapefile de polígono de um estado e retorna o arquivo diretamente.
@@ -157,24 +164,54 @@ async def stream_download_state(
       --output SP_AREA_PROPERTY.zip
     ```
     """
-    try:
-        service = SicarService()
+    while True:
+        # Shapefile ainda válido no cache em disco: sem captcha nem SICAR
+        # (stat em thread: disco lento/NFS não bloqueia o event loop)
+        cached_path = await asyncio.to_thread(
+            service.get_cached_polygon, body.state, body.polygon
+        )
+        if cached_path is not None:
+            return FileResponse(
+                cached_path,
+                media_type="application/zip",
+                filename=cached_path.name,
+            )
         
-        file_bytes, filename = service.download_polygon_as_bytes(
-            state=body.state.value,
-            polygon=body.polygon.value
+        # Outra requisição já baixa este estado: aguarda e lê do cache
+        # (se aquele download falhar, uma das que aguardam assume)
+        em_andamento = service.iniciar_download_estado(body.state, body.polygon)
+        if em_andamento is None:
+            break
+        await em_andamento.wait()
+    
+    try:
+        # Captcha é resolvido no pool SICAR; o corpo do ZIP é repassado
+        # ao cliente em blocos, sem ser carregado inteiro em memória
+        chunks, filename, content_length = await service.run_in_executor(
+            service.stream_polygon,
+            state=body.state,
+            polygon=body.polygon
         )
         
-        return StreamingResponse(
-            iter([file_bytes]),
+        # Blocos também são gravados no cache em disco durante o envio
+        return _StreamingResponseFinalizada(
+            service.cache_polygon_stream(chunks, body.state, body.polygon),
             media_type="application/zip",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}",
-                "Content-Length": str(len(file_bytes))
-            }
+                # Tamanho do SICAR: cliente exibe progresso do download
+                "Content-Length": str(content_length),
+            },
+            ao_finalizar=functools.partial(
+                service.concluir_download_estado, body.state, body.polygon
+            ),
         )
         
+    except asyncio.CancelledError:
+        service.concluir_download_estado(body.state, body.polygon)
+        raise
     except Exception as e:
+        service.concluir_download_estado(body.state, body.polygon)
         logger.error(f"Erro no download SICAR por estado: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -190,6 +227,7 @@ async def stream_download_state(
 async def stream_download_car(
     body: CarDownloadRequest,
     _api_key: RequireAPIKey,
+    service: SicarService = Depends(get_sicar_service),
 ):
     """
     Baixa shapefile de uma propriedade específica pelo número CAR.
@@ -212,14 +250,14 @@ async def stream_download_car(
     ```
     """
     try:
-        service = SicarService()
-        
-        file_bytes, filename = service.download_car_as_bytes(
+        file_bytes, filename = await service.run_single_flight(
+            ("car", body.car_number),
+            service.download_car_as_bytes,
             car_number=body.car_number
         )
         
-        return StreamingResponse(
-            iter([file_bytes]),
+        return Response(
+            content=file_bytes,
             media_type="application/zip",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}",
@@ -235,51 +273,69 @@ async def stream_download_car(
         )
 
 
+# ===== Resposta estática de /info =====
+# Conteúdo só depende de constantes de import: serializa uma única vez
+
+_SICAR_INFO_BYTES = orjson.dumps({
+    "service": "SICAR - Sistema de Cadastro Ambiental Rural",
+    "endpoints": {
+        "stream/state": {
+            "method": "POST",
+            "description": "Download de shapefile por estado",
+            "timeout_recommended": "2 minutos"
+        },
+        "stream/car": {
+            "method": "POST",
+            "description": "Download de shapefile por número CAR",
+            "timeout_recommended": "2 minutos"
+        },
+        "stream/state/processed": {
+            "method": "POST",
+            "description": "Download de shapefile processado por estado com SLD",
+            "timeout_recommended": "5 minutos"
+        },
+        "stream/car/processed": {
+            "method": "POST",
+            "description": "Download de shapefile de CAR processado com SLD",
+            "timeout_recommended": "5 minutos"
+        },
+        "temas": {
+            "method": "GET",
+            "description": "Lista todos os grupos de temas CAR"
+        },
+        "sld/{tema}": {
+            "method": "GET",
+            "description": "Gera arquivo SLD para um tema específico"
+        },
+        "cores": {
+            "method": "GET",
+            "description": "Retorna paleta de cores de todos os temas"
+        }
+    },
+    "available_polygons": AVAILABLE_POLYGONS,
+    "available_states": AVAILABLE_STATES,
+})
+_SICAR_INFO_ETAG = f'"{hashlib.sha256(_SICAR_INFO_BYTES).hexdigest()[:32]}"'
+
+
 @router.get(
     "/info",
     summary="Informações sobre endpoints SICAR",
 )
-async def sicar_info(_api_key: RequireAPIKey):
+async def sicar_info(
+    _api_key: RequireAPIKey,
+    if_none_match: Annotated[str | None, Header()] = None,
+):
     """Retorna informações sobre os endpoints SICAR disponíveis."""
-    return {
-        "service": "SICAR - Sistema de Cadastro Ambiental Rural",
-        "endpoints": {
-            "stream/state": {
-                "method": "POST",
-                "description": "Download de shapefile por estado",
-                "timeout_recommended": "2 minutos"
-            },
-            "stream/car": {
-                "method": "POST",
-                "description": "Download de shapefile por número CAR",
-                "timeout_recommended": "2 minutos"
-            },
-            "stream/state/processed": {
-                "method": "POST",
-                "description": "Download de shapefile processado por estado com SLD",
-                "timeout_recommended": "5 minutos"
-            },
-            "stream/car/processed": {
-                "method": "POST",
-                "description": "Download de shapefile de CAR processado com SLD",
-                "timeout_recommended": "5 minutos"
-            },
-            "temas": {
-                "method": "GET",
-                "description": "Lista todos os grupos de temas CAR"
-            },
-            "sld/{tema}": {
-                "method": "GET",
-                "description": "Gera arquivo SLD para um tema específico"
-            },
-            "cores": {
-                "method": "GET",
-                "description": "Retorna paleta de cores de todos os temas"
-            }
-        },
-        "available_polygons": AVAILABLE_POLYGONS,
-        "available_states": AVAILABLE_STATES,
-    }
+    headers = {"ETag": _SICAR_INFO_ETAG}
+    if etag_corresponde(if_none_match, _SICAR_INFO_ETAG):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return Response(
+        content=_SICAR_INFO_BYTES,
+        media_type="application/json",
+        headers=headers,
+    )
 
 
 # ===== Endpoints de Download Processado =====
@@ -292,6 +348,7 @@ async def sicar_info(_api_key: RequireAPIKey):
 async def stream_download_state_processed(
     body: ProcessedStateRequest,
     _api_key: RequireAPIKey,
+    service: SicarService = Depends(get_sicar_service),
 ):
     """
     Baixa um shapefile de polígono de um estado, processa e retorna organizado.
@@ -316,16 +373,16 @@ async def stream_download_state_processed(
     ```
     """
     try:
-        service = SicarService()
-        
-        file_bytes, filename, resultado = service.download_and_process_state(
+        file_bytes, filename, resultado = await service.run_single_flight(
+            ("state_processed", body.state, body.polygon, body.include_sld),
+            service.download_and_process_state,
             state=body.state,
             polygon=body.polygon,
             include_sld=body.include_sld
         )
         
-        return StreamingResponse(
-            iter([file_bytes]),
+        return Response(
+            content=file_bytes,
             media_type="application/zip",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}",
@@ -351,6 +408,7 @@ async def stream_download_state_processed(
 async def stream_download_car_processed(
     body: ProcessedCARRequest,
     _api_key: RequireAPIKey,
+    service: SicarService = Depends(get_sicar_service),
 ):
     """
     Baixa shapefile de uma propriedade específica, processa e retorna organizado.
@@ -375,15 +433,15 @@ async def stream_download_car_processed(
     ```
     """
     try:
-        service = SicarService()
-        
-        file_bytes, filename, resultado = service.download_and_process_car(
+        file_bytes, filename, resultado = await service.run_single_flight(
+            ("car_processed", body.car_number, body.include_sld),
+            service.download_and_process_car,
             car_number=body.car_number,
             include_sld=body.include_sld
         )
         
-        return StreamingResponse(
-            iter([file_bytes]),
+        return Response(
+            content=file_bytes,
             media_type="application/zip",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}",
@@ -402,6 +460,42 @@ async def stream_download_car_processed(
         )
 
 
+# ===== Respostas estáticas de temas CAR =====
+# Dados de referência fixos: validados e serializados uma única vez
+
+_GRUPOS_BYTES = orjson.dumps([
+    GrupoCAR(**grupo).model_dump() for grupo in listar_grupos()
+])
+
+_TEMAS_POR_GRUPO_BYTES: dict[str, bytes] = {
+    grupo: orjson.dumps(
+        GrupoTemasCAR(
+            classe=grupo,
+            nome_grupo=classe_dados["nome_grupo"],
+            ordem=classe_dados["ordem"],
+            temas=[TemaCAR(**tema) for tema in classe_dados["temas_possiveis"]],
+        ).model_dump()
+    )
+    for grupo, classe_dados in MODELO_CAR.items()
+}
+
+# A chave da paleta é o próprio arquivo_modelo do tema
+_PALETA_BYTES = orjson.dumps({
+    nome: PaletaCoresResponse(arquivo_modelo=nome, **dados).model_dump()
+    for nome, dados in obter_paleta_cores().items()
+})
+
+
+# SLD de cada tema, gerado na carga do módulo (conjunto fechado de temas);
+# em arquivo_modelo repetido vale o primeiro, como em gerar_sld_por_nome
+_SLD_BYTES: dict[str, bytes] = {}
+for _classe_dados in MODELO_CAR.values():
+    for _tema_info in _classe_dados["temas_possiveis"]:
+        if _tema_info["arquivo_modelo"] not in _SLD_BYTES:
+            _SLD_BYTES[_tema_info["arquivo_modelo"]] = criar_sld_para_tema(_tema_info).encode("utf-8")
+del _classe_dados, _tema_info
+
+
 # ===== Endpoints de Temas CAR =====
 
 @router.get(
@@ -422,8 +516,7 @@ async def listar_grupos_temas(_api_key: RequireAPIKey):
     - Área de Uso Restrito
     - Resumo
     """
-    grupos = listar_grupos()
-    return [GrupoCAR(**grupo) for grupo in grupos]
+    return Response(content=_GRUPOS_BYTES, media_type="application/json")
 
 
 @router.get(
@@ -447,21 +540,14 @@ async def listar_temas_grupo(
     - `Area_de_Preservacao_Permanente`
     - `Reserva_Legal`
     """
-    if grupo not in MODELO_CAR:
+    body = _TEMAS_POR_GRUPO_BYTES.get(grupo)
+    if body is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Grupo '{grupo}' não encontrado. Grupos disponíveis: {list(MODELO_CAR.keys())}"
         )
     
-    classe_dados = MODELO_CAR[grupo]
-    temas = [TemaCAR(**tema) for tema in classe_dados["temas_possiveis"]]
-    
-    return GrupoTemasCAR(
-        classe=grupo,
-        nome_grupo=classe_dados["nome_grupo"],
-        ordem=classe_dados["ordem"],
-        temas=temas
-    )
+    return Response(content=body, media_type="application/json")
 
 
 @router.get(
@@ -483,7 +569,7 @@ async def gerar_sld_tema(
     - `/sld/Reserva_Legal_Proposta`
     - `/sld/APP_Rios_ate_10_metros`
     """
-    sld_content = gerar_sld_por_nome(tema)
+    sld_content = _SLD_BYTES.get(tema)
     
     if sld_content is None:
         raise HTTPException(
@@ -512,11 +598,7 @@ async def obter_paleta(_api_key: RequireAPIKey):
     Útil para criar visualizações customizadas ou integrar
     com outros sistemas GIS.
     """
-    paleta = obter_paleta_cores()
-    return {
-        nome: PaletaCoresResponse(**dados)
-        for nome, dados in paleta.items()
-    }
+    return Response(content=_PALETA_BYTES, media_type="application/json")
 
 
 # ===== Endpoints de Consulta CAR (Demonstrativo) =====
@@ -535,6 +617,7 @@ async def obter_paleta(_api_key: RequireAPIKey):
 async def consultar_car(
     car_code: str,
     _api_key: RequireAPIKey,
+    service: CarConsultaService = Depends(get_car_consulta_service),
 ):
     """
     Retorna JSON com todas as informações do registro CAR informado.
@@ -559,20 +642,31 @@ async def consultar_car(
       -H "X-API-Key: sua-api-key"
     ```
     """
-    car_code = car_code.strip()
-    if len(car_code) < 10 or car_code.count("-") < 2:
+    car_code = car_code.strip().upper()
+    if not _CAR_CODE_PATTERN.fullmatch(car_code):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Código CAR inválido. Formato esperado: UF-CODIGOMUNICIPIO-HASH",
         )
 
+    body = _demonstrativo_cache.get(car_code)
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers={"X-Cache": "HIT"})
+
     try:
-        service = CarConsultaService()
-        dados = service.consultar_demonstrativo(car_code)
+        async with _consulta_car_limite:
+            dados = await asyncio.to_thread(service.consultar_demonstrativo, car_code)
         
         # Remover dados brutos da resposta tipada
         dados_sem_brutos = {k: v for k, v in dados.items() if k != "_dados_brutos"}
-        return DemonstrativoCAR(**dados_sem_brutos)
+        demonstrativo = DemonstrativoCAR(**dados_sem_brutos)
+
+        # Serializa direto com orjson (estrutura aninhada e extensa);
+        # response_model permanece para documentação OpenAPI
+        body = orjson.dumps(demonstrativo.model_dump(mode="json"))
+        _demonstrativo_cache.set(car_code, body)
+
+        return Response(content=body, media_type="application/json", headers={"X-Cache": "MISS"})
         
     except CarConsultaError as e:
         logger.error(f"Erro ao consultar CAR {car_code}: {e}")
@@ -599,7 +693,7 @@ async def consultar_car(
 @router.get(
     "/consulta/{car_code}/pdf",
     summary="PDF do demonstrativo CAR",
-    response_class=StreamingResponse,
+    response_class=Response,
     responses={
         200: {
             "description": "PDF do demonstrativo",
@@ -613,6 +707,7 @@ async def consultar_car(
 async def consultar_car_pdf(
     car_code: str,
     _api_key: RequireAPIKey,
+    service: CarConsultaService = Depends(get_car_consulta_service),
 ):
     """
     Retorna PDF do demonstrativo do registro CAR, no formato similar ao oficial.
@@ -637,26 +732,35 @@ async def consultar_car_pdf(
       --output demonstrativo.pdf
     ```
     """
-    car_code = car_code.strip()
-    if len(car_code) < 10 or car_code.count("-") < 2:
+    car_code = car_code.strip().upper()
+    if not _CAR_CODE_PATTERN.fullmatch(car_code):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Código CAR inválido. Formato esperado: UF-CODIGOMUNICIPIO-HASH",
         )
 
     try:
-        service = CarConsultaService()
-        pdf_bytes = service.gerar_pdf_demonstrativo(car_code)
+        pdf_bytes = _demonstrativo_pdf_cache.get(car_code)
+        cache_status = "HIT"
+        if pdf_bytes is None:
+            async with _consulta_car_limite:
+                dados = await asyncio.to_thread(service.consultar_demonstrativo, car_code)
+            # Renderização (ReportLab) fora do semáforo: só a consulta
+            # ao car.gov.br ocupa vaga do limite de concorrência
+            pdf_bytes = await asyncio.to_thread(service.gerar_pdf_demonstrativo_from_data, dados)
+            _demonstrativo_pdf_cache.set(car_code, pdf_bytes)
+            cache_status = "MISS"
         
         safe_name = car_code.replace("/", "_")
         filename = f"Demonstrativo_{safe_name}.pdf"
         
-        return StreamingResponse(
-            iter([pdf_bytes]),
+        return Response(
+            content=pdf_bytes,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f'attachment; filename="{filename}"',
                 "Content-Length": str(len(pdf_bytes)),
+                "X-Cache": cache_status,
             },
         )
         
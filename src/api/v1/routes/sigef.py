@@ -6,19 +6,23 @@ Endpoints disponíveis:
 - GET /v1/sigef/arquivo/csv/{codigo}/{tipo} - Download CSV específico
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
-import io
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.types import Receive, Scope, Send
+import asyncio
+import hashlib
+import os
+import time
 import zipfile
 
 from src.api.v1.dependencies import get_sigef_service, RequireAPIKey
 from src.api.v1.schemas import TipoExportacaoEnum
-from src.core.exceptions import (
-    InvalidParcelaCodeError,
-    ParcelaNotFoundError,
-    SessionExpiredError,
-    SigefError,
-)
+from src.core.cache import etag_corresponde
+from src.core.config import get_settings
 from src.core.logging import get_logger
 from src.domain.entities import TipoExportacao
 from src.services.sigef_service import SigefService
@@ -27,9 +31,154 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/sigef", tags=["SIGEF"])
 
+# Downloads abrem sockets e arquivos: sob rajada, limita quantos
+# ficam em andamento para não esgotar descritores do processo.
+# A vaga vale para a resposta inteira: os arquivos ficam abertos
+# enquanto o cliente lê
+_downloads_limite = asyncio.BoundedSemaphore(get_settings().sigef_max_inflight)
+
+
+class _LiberaVaga(Response):
+    """
+    Resposta que libera a vaga de download ao terminar o envio.
+    
+    Cobre também desconexão do cliente e erros de Range (400/416),
+    casos em que o BackgroundTask da resposta não é executado.
+    """
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            _downloads_limite.release()
+
+
+class _FileResponseComVaga(_LiberaVaga, FileResponse):
+    pass
+
+
+class _StreamingResponseComVaga(_LiberaVaga, StreamingResponse):
+    pass
+
+# Tamanho dos blocos lidos dos arquivos ao montar o ZIP (64 KB)
+ZIP_CHUNK_SIZE = 64 * 1024
+
+# Nível 3: CSV comprime quase o mesmo que no 6 (padrão), bem mais rápido
+ZIP_COMPRESSLEVEL = 3
+
+# Formatos já comprimidos internamente: armazenados sem recompressão
+_EXTENSOES_SEM_COMPRESSAO = frozenset({".pdf", ".zip"})
+
+# Tipo da API -> tipo do domínio, resolvido uma única vez
+_TIPO_DOMINIO: dict[TipoExportacaoEnum, TipoExportacao] = {
+    tipo: TipoExportacao(tipo.value) for tipo in TipoExportacaoEnum
+}
+
+
+class _ZipSink:
+    """Destino não-seekable do ZipFile: acumula bytes até serem drenados."""
+    
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+    
+    def write(self, data: bytes, /) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self) -> None:
+        pass
+    
+    def close(self) -> None:
+        pass
+    
+    def drenar(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _etag_arquivos(stats: Iterable[tuple[Path, os.stat_result]]) -> str:
+    """
+    ETag derivado de nome, mtime e tamanho dos arquivos baixados.
+    
+    Muda sempre que o SIGEF é consultado de novo e o arquivo regravado;
+    enquanto o download em disco for reaproveitado, o cliente recebe 304.
+    """
+    digest = hashlib.sha1()
+    for path, st in stats:
+        digest.update(f"{path.name}:{st.st_mtime_ns}:{st.st_size};".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def _candidatos_zip(
+    codigo: UUID,
+    csv_paths: dict[str, Path],
+    memorial_path: Path | None,
+) -> list[tuple[Path, str]]:
+    """Lista (arquivo, nome no ZIP) dos CSVs e do memorial, se disponível."""
+    candidatos = [
+        (path, f"{codigo}_{tipo}.csv") for tipo, path in csv_paths.items()
+    ]
+    if memorial_path:
+        candidatos.append((memorial_path, f"{codigo}_memorial.pdf"))
+    return candidatos
+
+
+def _arquivos_do_zip(
+    candidatos: list[tuple[Path, str]],
+) -> tuple[list[tuple[Path, str]], str]:
+    """
+    Filtra os arquivos existentes e calcula o ETag (fraco) do ZIP.
+    
+    Um único stat por arquivo serve à verificação de existência
+    e ao ETag.
+    """
+    arquivos: list[tuple[Path, str]] = []
+    stats: list[tuple[Path, os.stat_result]] = []
+    for path, nome in candidatos:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        arquivos.append((path, nome))
+        stats.append((path, st))
+    # ETag fraco: o conteúdo equivale, mas o ZIP não é idêntico
+    # byte a byte (datas das entradas)
+    return arquivos, "W/" + _etag_arquivos(stats)
+
+
+def _gerar_zip(arquivos: list[tuple[Path, str]]) -> Iterator[bytes]:
+    """
+    Gera o ZIP em blocos, à medida que os arquivos são comprimidos.
+    
+    Nada é bufferizado além do bloco atual: o cliente começa a
+    receber o ZIP antes de ele estar completo.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(
+        sink, "w", zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESSLEVEL
+    ) as zip_file:
+        for path, nome in arquivos:
+            entrada: str | zipfile.ZipInfo = nome
+            if path.suffix.lower() in _EXTENSOES_SEM_COMPRESSAO:
+                entrada = zipfile.ZipInfo(nome, date_time=time.localtime()[:6])
+                entrada.compress_type = zipfile.ZIP_STORED
+            
+            with path.open("rb") as origem, zip_file.open(entrada, "w") as destino:
+                while bloco := origem.read(ZIP_CHUNK_SIZE):
+                    destino.write(bloco)
+                    if dados := sink.drenar():
+                        yield dados
+            if dados := sink.drenar():
+                yield dados
+    
+    # Diretório central (escrito ao fechar o ZipFile)
+    yield sink.drenar()
+
 
-@router.get(
+@router.api_route(
     "/arquivo/csv/{codigo}/{tipo}",
+    methods=["GET", "HEAD"],
     summary="📄 Download direto de CSV",
     description="""
 Download de arquivo CSV da parcela SIGEF.
@@ -41,62 +190,70 @@ Download de arquivo CSV da parcela SIGEF.
 | `parcela` | Dados gerais da parcela |
 | `vertice` | Coordenadas dos vértices |
 | `limite` | Polígono de limites |
+
+Suporta `Range` para retomada de downloads interrompidos
+(o CSV é enviado sem compressão gzip).
     """,
     responses={
         200: {
             "description": "Arquivo CSV",
             "content": {"text/csv": {}},
         },
-        400: {"description": "Código de parcela inválido"},
+        206: {
+            "description": "Trecho do CSV (requisição com Range)",
+            "content": {"text/csv": {}},
+        },
+        304: {"description": "Não modificado (If-None-Match com o ETag atual)"},
+        422: {"description": "Código de parcela inválido (UUID esperado)"},
         401: {"description": "Sessão expirada"},
         404: {"description": "Parcela não encontrada"},
         502: {"description": "Erro ao comunicar com SIGEF"},
     },
 )
 async def download_csv_arquivo(
-    codigo: str,
+    codigo: UUID,
     tipo: TipoExportacaoEnum,
     _api_key: RequireAPIKey,
     sigef_service: SigefService = Depends(get_sigef_service),
+    if_none_match: str | None = Header(None),
 ):
     """
     Retorna arquivo CSV como stream para download direto.
     """
+    tipo_domain = _TIPO_DOMINIO[tipo]
+    
+    await _downloads_limite.acquire()
     try:
-        tipo_domain = TipoExportacao(tipo.value)
-        
         path = await sigef_service.download_csv(
-            codigo=codigo,
+            codigo=str(codigo),
             tipo=tipo_domain,
         )
         
-        content = path.read_bytes()
+        # stat em thread: disco lento/NFS não bloqueia o event loop
+        st = await asyncio.to_thread(path.stat)
+        etag = _etag_arquivos([(path, st)])
+        if etag_corresponde(if_none_match, etag):
+            _downloads_limite.release()
+            return Response(status_code=304, headers={"ETag": etag})
         
-        return StreamingResponse(
-            io.BytesIO(content),
+        # FileResponse envia do disco em blocos (Content-Length via stat),
+        # sem carregar o CSV inteiro em memória
+        filename = f"{codigo}_{tipo.value}.csv"
+        return _FileResponseComVaga(
+            path,
             media_type="text/csv",
-            headers={
-                "Content-Disposition": f'attachment; filename="{codigo}_{tipo.value}.csv"',
-                "Content-Length": str(len(content)),
-                "X-Filename": f"{codigo}_{tipo.value}.csv",
-            },
+            filename=filename,
+            headers={"X-Filename": filename, "ETag": etag},
+            stat_result=st,  # reaproveita o stat do ETag
         )
-        
-    except InvalidParcelaCodeError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-        
-    except ParcelaNotFoundError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-        
-    except SessionExpiredError as e:
-        raise HTTPException(status_code=401, detail=str(e))
-        
-    except SigefError as e:
-        raise HTTPException(status_code=502, detail=str(e))
+    except BaseException:
+        _downloads_limite.release()
+        raise
 
 
-@router.get(
+@router.api_route(
     "/arquivo/todos/{codigo}",
+    methods=["GET", "HEAD"],
     summary="📦 Download completo (ZIP com todos arquivos)",
     description="""
 Download de todos os arquivos da parcela em um único ZIP.
@@ -115,67 +272,80 @@ Download de todos os arquivos da parcela em um único ZIP.
             "description": "Arquivo ZIP",
             "content": {"application/zip": {}},
         },
-        400: {"description": "Código de parcela inválido"},
+        304: {"description": "Não modificado (If-None-Match com o ETag atual)"},
+        422: {"description": "Código de parcela inválido (UUID esperado)"},
         401: {"description": "Sessão expirada"},
         404: {"description": "Parcela não encontrada"},
         502: {"description": "Erro ao comunicar com SIGEF"},
     },
 )
 async def download_todos_arquivos(
-    codigo: str,
+    codigo: UUID,
+    request: Request,
     _api_key: RequireAPIKey,
     sigef_service: SigefService = Depends(get_sigef_service),
+    if_none_match: str | None = Header(None),
 ):
     """
     Retorna ZIP com todos os arquivos da parcela.
+    
+    HEAD não consulta o SIGEF: responde a partir dos arquivos já
+    baixados (com ETag) ou, se não estiverem em cache, só com os
+    headers do download (sem ETag).
     """
+    filename = f"{codigo}_completo.zip"
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "X-Filename": filename,
+    }
+    
+    if request.method == "HEAD":
+        em_cache = await sigef_service.get_cached_files(codigo=str(codigo))
+        if em_cache is not None:
+            _, etag = await asyncio.to_thread(
+                _arquivos_do_zip, _candidatos_zip(codigo, *em_cache)
+            )
+            if etag_corresponde(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            headers["ETag"] = etag
+        return Response(media_type="application/zip", headers=headers)
+    
+    await _downloads_limite.acquire()
     try:
-        # Baixa todos os CSVs
-        csv_paths = await sigef_service.download_all_csvs(codigo=codigo)
-        
-        # Tenta baixar memorial (pode não estar disponível)
-        memorial_path = None
-        try:
-            memorial_path = await sigef_service.download_memorial(codigo=codigo)
-        except Exception as e:
-            logger.warning(f"Memorial não disponível para {codigo}: {e}")
+        # CSVs e memorial em paralelo: tempo total é o do mais lento
+        csv_paths, memorial = await asyncio.gather(
+            sigef_service.download_all_csvs(codigo=str(codigo)),
+            sigef_service.download_memorial(codigo=str(codigo)),
+            return_exceptions=True,
+        )
         
-        # Cria ZIP em memória
-        zip_buffer = io.BytesIO()
+        # Falha nos CSVs é erro da requisição
+        if isinstance(csv_paths, BaseException):
+            raise csv_paths
         
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            # Adiciona CSVs
-            for tipo, path_str in csv_paths.items():
-                from pathlib import Path
-                path = Path(path_str)
-                if path.exists():
-                    zip_file.write(path, f"{codigo}_{tipo}.csv")
-            
-            # Adiciona memorial se disponível
-            if memorial_path and memorial_path.exists():
-                zip_file.write(memorial_path, f"{codigo}_memorial.pdf")
+        # Memorial pode não estar disponível
+        memorial_path = None
+        if isinstance(memorial, BaseException):
+            logger.warning(f"Memorial não disponível para {codigo}: {memorial}")
+        else:
+            memorial_path = memorial
         
-        zip_buffer.seek(0)
-        content = zip_buffer.read()
+        # exists/stat em thread: disco lento/NFS não bloqueia o event loop
+        arquivos, etag = await asyncio.to_thread(
+            _arquivos_do_zip, _candidatos_zip(codigo, csv_paths, memorial_path)
+        )
+        if etag_corresponde(if_none_match, etag):
+            _downloads_limite.release()
+            return Response(status_code=304, headers={"ETag": etag})
         
-        return StreamingResponse(
-            io.BytesIO(content),
+        # ZIP gerado em streaming (tamanho final desconhecido: sem Content-Length)
+        headers["ETag"] = etag
+        return _StreamingResponseComVaga(
+            _gerar_zip(arquivos),
             media_type="application/zip",
-            headers={
-                "Content-Disposition": f'attachment; filename="{codigo}_completo.zip"',
-                "Content-Length": str(len(content)),
-                "X-Filename": f"{codigo}_completo.zip",
-            },
+            headers=headers,
         )
-        
-    except InvalidParcelaCodeError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-        
-    except ParcelaNotFoundError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-        
-    except SessionExpiredError as e:
-        raise HTTPException(status_code=401, detail=str(e))
-        
-    except SigefError as e:
-        raise HTTPException(status_code=502, detail=str(e))
+    except BaseException:
+        _downloads_limite.release()
+        raise
+
@@ -5,20 +5,20 @@ Endpoint POST /api/sigef/bbox que consulta o WFS do GeoOne GeoINCRA
 e retorna parcelas certificadas / territórios dentro da área geográfica.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
 from src.api.v1.dependencies import RequireAPIKey, get_incra_bbox_service
 from src.api.v1.schemas_incra_bbox import (
-    BoundingBoxIncraSchema,
     ConsultaIncraBboxRequest,
     ConsultaIncraBboxResponse,
-    FeatureGenericaSchema,
     IncraBboxErrorResponse,
-    ParcelaIncraSchema,
 )
 from src.core.logging import get_logger
 from src.services.incra_bbox_service import (
-    ConsultaIncraBboxResultado,
     IncraBboxService,
     IncraBboxServiceError,
 )
@@ -27,6 +27,12 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/sigef", tags=["SIGEF"])
 
+# Mapeamento código de erro do serviço -> HTTP status (imutável)
+_CODIGO_HTTP_POR_ERRO: Mapping[str, int] = MappingProxyType({
+    "GEOONE_TIMEOUT": status.HTTP_504_GATEWAY_TIMEOUT,
+    "GEOONE_INDISPONIVEL": status.HTTP_502_BAD_GATEWAY,
+})
+
 
 @router.post(
     "/bbox",
@@ -58,7 +64,7 @@ async def consultar_incra_por_bbox(
     request: ConsultaIncraBboxRequest,
     _api_key: RequireAPIKey,
     service: IncraBboxService = Depends(get_incra_bbox_service),
-) -> ConsultaIncraBboxResponse:
+) -> Response:
     """
     Consulta parcelas INCRA dentro de um Bounding Box.
 
@@ -89,57 +95,13 @@ async def consultar_incra_por_bbox(
             },
         ) from e
 
-    return _resultado_para_response(resultado)
+    # Dataclasses do serviço já têm o formato do schema: orjson as
+    # serializa nativamente, sem montar modelos Pydantic intermediários;
+    # response_model permanece para documentação OpenAPI
+    return Response(content=orjson.dumps(resultado), media_type="application/json")
 
 
 def _mapear_codigo_http(codigo_erro: str) -> int:
     """Mapeia código de erro do serviço para HTTP status code."""
-    mapeamento = {
-        "GEOONE_TIMEOUT": status.HTTP_504_GATEWAY_TIMEOUT,
-        "GEOONE_INDISPONIVEL": status.HTTP_502_BAD_GATEWAY,
-    }
-    return mapeamento.get(codigo_erro, status.HTTP_502_BAD_GATEWAY)
-
-
-def _resultado_para_response(
-    resultado: ConsultaIncraBboxResultado,
-) -> ConsultaIncraBboxResponse:
-    """Converte resultado do serviço para schema de response."""
-    parcelas_schema = [
-        ParcelaIncraSchema(
-            id=p.id,
-            parcela_codigo=p.parcela_codigo,
-            codigo_imovel=p.codigo_imovel,
-            nome_area=p.nome_area,
-            status=p.status,
-            situacao=p.situacao,
-            rt=p.rt,
-            art=p.art,
-            data_submissao=p.data_submissao,
-            data_aprovacao=p.data_aprovacao,
-            registro_matricula=p.registro_matricula,
-            registro_destaque=p.registro_destaque,
-            municipio_ibge=p.municipio_ibge,
-            uf=p.uf,
-        )
-        for p in resultado.parcelas
-    ]
-
-    features_schema = [
-        FeatureGenericaSchema(
-            id=f.id,
-            propriedades=f.propriedades,
-        )
-        for f in resultado.features_genericas
-    ]
+    return _CODIGO_HTTP_POR_ERRO.get(codigo_erro, status.HTTP_502_BAD_GATEWAY)
 
-    return ConsultaIncraBboxResponse(
-        total_encontrados=resultado.total_encontrados,
-        total_retornados=resultado.total_retornados,
-        bbox_consultado=BoundingBoxIncraSchema(**resultado.bbox_consultado),
-        camada=resultado.camada,
-        camada_descricao=resultado.camada_descricao,
-        srs=resultado.srs,
-        parcelas=parcelas_schema,
-        features_genericas=features_schema,
-    )
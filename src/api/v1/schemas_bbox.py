@@ -0,0 +1,64 @@
+"""
+Schema Pydantic de Bounding Box compartilhado pelos endpoints de consulta
+espacial (CAR e INCRA).
+
+Um único modelo evita que o pydantic-core construa validadores e
+serializadores duplicados para a mesma estrutura.
+"""
+
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class BoundingBoxSchema(BaseModel):
+    """Bounding Box geográfico em EPSG:4674 (SIRGAS 2000)."""
+
+    min_lon: float = Field(
+        ...,
+        ge=-180,
+        le=180,
+        description="Longitude mínima (oeste)",
+        examples=[-47.1],
+    )
+    min_lat: float = Field(
+        ...,
+        ge=-90,
+        le=90,
+        description="Latitude mínima (sul)",
+        examples=[-23.6],
+    )
+    max_lon: float = Field(
+        ...,
+        ge=-180,
+        le=180,
+        description="Longitude máxima (leste)",
+        examples=[-47.0],
+    )
+    max_lat: float = Field(
+        ...,
+        ge=-90,
+        le=90,
+        description="Latitude máxima (norte)",
+        examples=[-23.5],
+    )
+
+    def model_post_init(self, __context: Any) -> None:
+        """
+        Valida que min < max para lon e lat.
+
+        Roda dentro da validação do pydantic-core (o ValueError vira
+        ValidationError/422), sem o despacho de um after-validator.
+        """
+        if self.min_lon >= self.max_lon:
+            raise ValueError(
+                f"min_lon ({self.min_lon}) deve ser menor que max_lon ({self.max_lon})"
+            )
+        if self.min_lat >= self.max_lat:
+            raise ValueError(
+                f"min_lat ({self.min_lat}) deve ser menor que max_lat ({self.max_lat})"
+            )
+
+    def to_wfs_string(self) -> str:
+        """Converte para o formato WFS BBOX: 'minLon,minLat,maxLon,maxLat'."""
+        return f"{self.min_lon},{self.min_lat},{self.max_lon},{self.max_lat}"
@@ -6,8 +6,9 @@ Separado do schemas.py principal para seguir o princípio de impacto mínimo.
 
 from typing import Any
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field
 
+from src.api.v1.schemas_bbox import BoundingBoxSchema
 from src.domain.entities.incra_wfs import CamadaIncra
 
 
@@ -15,60 +16,14 @@ from src.domain.entities.incra_wfs import CamadaIncra
 #  Request Models
 # ──────────────────────────────────────────────
 
-class BoundingBoxIncraSchema(BaseModel):
-    """Bounding Box geográfico em EPSG:4674 (SIRGAS 2000)."""
-
-    min_lon: float = Field(
-        ...,
-        ge=-180,
-        le=180,
-        description="Longitude mínima (oeste)",
-        examples=[-47.1],
-    )
-    min_lat: float = Field(
-        ...,
-        ge=-90,
-        le=90,
-        description="Latitude mínima (sul)",
-        examples=[-23.6],
-    )
-    max_lon: float = Field(
-        ...,
-        ge=-180,
-        le=180,
-        description="Longitude máxima (leste)",
-        examples=[-47.0],
-    )
-    max_lat: float = Field(
-        ...,
-        ge=-90,
-        le=90,
-        description="Latitude máxima (norte)",
-        examples=[-23.5],
-    )
-
-    @model_validator(mode="after")
-    def validar_ordem_bbox(self) -> "BoundingBoxIncraSchema":
-        """Valida que min < max para lon e lat."""
-        if self.min_lon >= self.max_lon:
-            raise ValueError(
-                f"min_lon ({self.min_lon}) deve ser menor que max_lon ({self.max_lon})"
-            )
-        if self.min_lat >= self.max_lat:
-            raise ValueError(
-                f"min_lat ({self.min_lat}) deve ser menor que max_lat ({self.max_lat})"
-            )
-        return self
-
-    def to_wfs_string(self) -> str:
-        """Converte para o formato WFS BBOX: 'minLon,minLat,maxLon,maxLat'."""
-        return f"{self.min_lon},{self.min_lat},{self.max_lon},{self.max_lat}"
+# Mantido por compatibilidade: o BBox é o mesmo schema do endpoint CAR
+BoundingBoxIncraSchema = BoundingBoxSchema
 
 
 class ConsultaIncraBboxRequest(BaseModel):
     """Request para consulta de parcelas INCRA dentro de um Bounding Box."""
 
-    bbox: BoundingBoxIncraSchema = Field(
+    bbox: BoundingBoxSchema = Field(
         ...,
         description="Bounding Box geográfico da área de busca",
     )
@@ -212,7 +167,7 @@ class ConsultaIncraBboxResponse(BaseModel):
         description="Quantidade efetivamente retornada nesta resposta",
         examples=[50],
     )
-    bbox_consultado: BoundingBoxIncraSchema = Field(
+    bbox_consultado: BoundingBoxSchema = Field(
         ...,
         description="O BBox utilizado na consulta",
     )
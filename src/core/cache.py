@@ -0,0 +1,125 @@
+"""
+Cache em memória com expiração (TTL).
+
+Cache local ao processo, usado para evitar I/O repetido
+(disco, serviços externos) em caminhos quentes da API.
+Em deploy com vários workers, cada processo mantém o seu.
+
+Inclui também a coalescência de operações concorrentes (single-flight)
+e a validação de ETags de requisições condicionais.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class TTLCache:
+    """
+    Cache LRU com tempo de vida por entrada.
+
+    Thread-safe: pode ser usado tanto no event loop quanto
+    em funções executadas via run_in_executor.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 60.0):
+        """
+        Inicializa o cache.
+
+        Args:
+            maxsize: Número máximo de entradas (remove a menos usada).
+            ttl: Tempo de vida padrão das entradas, em segundos.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retorna valor em cache ou `default` se ausente/expirado."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Armazena valor (ttl sobrescreve o padrão do cache)."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove uma entrada (se existir)."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove todas as entradas."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SingleFlight:
+    """
+    Coalesce execuções concorrentes de uma mesma operação.
+
+    Chamadas com a mesma chave enquanto a primeira ainda executa
+    aguardam o mesmo resultado. A operação não é cancelada se quem
+    a iniciou desconectar. Deve ser usado a partir do event loop.
+    """
+
+    def __init__(self) -> None:
+        self._em_andamento: dict[Hashable, asyncio.Future[Any]] = {}
+
+    async def run(
+        self,
+        key: Hashable,
+        operation: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Executa `operation` ou aguarda a execução em andamento da chave."""
+        task = self._em_andamento.get(key)
+        if task is None:
+            task = asyncio.ensure_future(operation())
+            self._em_andamento[key] = task
+
+            def _finalizar(t: asyncio.Future[Any]) -> None:
+                self._em_andamento.pop(key, None)
+                # Marca exceção como consumida se nenhum chamador restou
+                if not t.cancelled():
+                    t.exception()
+
+            task.add_done_callback(_finalizar)
+
+        return await asyncio.shield(task)
+
+
+def etag_corresponde(if_none_match: str | None, etag: str | None) -> bool:
+    """Compara If-None-Match com o ETag (comparação fraca, RFC 9110)."""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    alvo = etag.removeprefix("W/")
+    return any(
+        candidato.strip().removeprefix("W/") == alvo
+        for candidato in if_none_match.split(",")
+    )
@@ -3,6 +3,7 @@ Gov-Auth Enterprise API
 Configurações por ambiente
 """
 
+import re
 from functools import lru_cache
 from pathlib import Path
 from typing import Literal
@@ -14,6 +15,9 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 # Base path calculado uma vez
 _BASE_PATH = Path(__file__).parent.parent.parent
 
+# Digest SHA-256 em hexadecimal
+_SHA256_HEX = re.compile(r"[0-9a-fA-F]{64}")
+
 
 class Settings(BaseSettings):
     """Configurações da aplicação com validação via Pydantic."""
@@ -34,6 +38,9 @@ class Settings(BaseSettings):
     # API
     api_prefix: str = "/api/v1"
     api_key: str = "dev-api-key-change-in-production"
+    # SHA-256 (hex) de chaves adicionais aceitas, separados por vírgula
+    # (rotação sem expor a chave em texto plano)
+    api_key_hashes: str = ""
     
     # Server
     host: str = "127.0.0.1"
@@ -50,6 +57,11 @@ class Settings(BaseSettings):
     # SIGEF
     sigef_base_url: str = "https://sigef.incra.gov.br"
     sigef_session_timeout_hours: int = 4
+    # Parcelas baixadas simultaneamente em lote e requisições
+    # simultâneas ao SIGEF (por processo)
+    sigef_max_concurrency: int = 10
+    # Downloads SIGEF em andamento por processo (limite de sockets/arquivos)
+    sigef_max_inflight: int = 200
     
     # WFS (Web Feature Service)
     wfs_incra_base_url: str = "https://acervofundiario.incra.gov.br/i3geo/ogc.php"
@@ -57,6 +69,13 @@ class Settings(BaseSettings):
     wfs_request_timeout: int = 60
     wfs_max_features: int = 10000
     
+    # Cache (em memória, por processo)
+    auth_session_cache_ttl_seconds: int = 30
+    car_bbox_cache_ttl_seconds: int = 300
+    sicar_state_cache_ttl_seconds: int = 86400
+    car_consulta_cache_ttl_seconds: int = 3600
+    sigef_download_cache_ttl_seconds: int = 3600
+    
     # Logging
     log_level: str = "INFO"
     log_format: Literal["json", "console"] = "console"
@@ -88,6 +107,31 @@ class Settings(BaseSettings):
         
         return v
     
+    @field_validator("api_key_hashes")
+    @classmethod
+    def validate_api_key_hashes(cls, v: str) -> str:
+        """
+        Valida API_KEY_HASHES na inicialização.
+        
+        Um valor malformado falha ao carregar as configurações, em vez
+        de derrubar toda requisição autenticada.
+        """
+        hashes = [h.strip() for h in v.split(",") if h.strip()]
+        for h in hashes:
+            if not _SHA256_HEX.fullmatch(h):
+                raise ValueError(
+                    "API_KEY_HASHES deve conter apenas SHA-256 em hexadecimal "
+                    "(64 caracteres), separados por vírgula"
+                )
+        return ",".join(h.lower() for h in hashes)
+    
+    @property
+    def api_key_hash_digests(self) -> frozenset[bytes]:
+        """Digests (bytes) de API_KEY_HASHES, já validados."""
+        return frozenset(
+            bytes.fromhex(h) for h in self.api_key_hashes.split(",") if h
+        )
+    
     @property
     def base_path(self) -> Path:
         """Caminho base do projeto."""
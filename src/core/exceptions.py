@@ -9,6 +9,9 @@ from typing import Any, Optional
 class GovAuthException(Exception):
     """Exceção base da aplicação."""
     
+    # Status HTTP usado pelo exception handler global da API
+    status_code: int = 500
+    
     def __init__(
         self,
         message: str,
@@ -26,6 +29,8 @@ class GovAuthException(Exception):
 class AuthenticationError(GovAuthException):
     """Erro de autenticação."""
     
+    status_code = 401
+    
     def __init__(self, message: str = "Falha na autenticação", details: Optional[dict] = None):
         super().__init__(message, code="AUTH_ERROR", details=details)
 
@@ -59,6 +64,8 @@ class CertificateError(AuthenticationError):
 class IntegrationError(GovAuthException):
     """Erro de integração com serviço externo."""
     
+    status_code = 502
+    
     def __init__(self, message: str, service: str, details: Optional[dict] = None):
         super().__init__(message, code="INTEGRATION_ERROR", details=details)
         self.service = service
@@ -84,6 +91,8 @@ class SigefError(IntegrationError):
 class ParcelaNotFoundError(SigefError):
     """Parcela não encontrada no SIGEF."""
     
+    status_code = 404
+    
     def __init__(self, codigo: str, details: Optional[dict] = None):
         super().__init__(f"Parcela não encontrada: {codigo}", details=details)
         self.code = "PARCELA_NOT_FOUND"
@@ -95,6 +104,8 @@ class ParcelaNotFoundError(SigefError):
 class ValidationError(GovAuthException):
     """Erro de validação."""
     
+    status_code = 400
+    
     def __init__(self, message: str, field: Optional[str] = None, details: Optional[dict] = None):
         super().__init__(message, code="VALIDATION_ERROR", details=details)
         if field:
@@ -5,6 +5,14 @@ Utilitários de segurança.
 import re
 from typing import Any
 
+# Padrões pré-compilados (usados a cada linha de log)
+_NON_DIGIT_PATTERN = re.compile(r"[^\d]")
+
+# Chaves sensíveis: uma única varredura por chave em vez de N substrings
+_SENSITIVE_KEY_PATTERN = re.compile(
+    r"cpf|cnpj|password|senha|token|api_key|secret|authorization|cookie"
+)
+
 
 def mask_cpf(cpf: str | None) -> str:
     """
@@ -15,7 +23,7 @@ def mask_cpf(cpf: str | None) -> str:
     if not cpf:
         return "N/A"
     
-    cpf = re.sub(r"[^\d]", "", cpf)
+    cpf = _NON_DIGIT_PATTERN.sub("", cpf)
     
     if len(cpf) != 11:
         return "***INVALID***"
@@ -32,7 +40,7 @@ def mask_cnpj(cnpj: str | None) -> str:
     if not cnpj:
         return "N/A"
     
-    cnpj = re.sub(r"[^\d]", "", cnpj)
+    cnpj = _NON_DIGIT_PATTERN.sub("", cnpj)
     
     if len(cnpj) != 14:
         return "***INVALID***"
@@ -60,18 +68,13 @@ def sanitize_log_data(data: dict[str, Any]) -> dict[str, Any]:
     Sanitiza dicionário para logging seguro.
     Remove/mascara dados sensíveis.
     """
-    sensitive_keys = {
-        "cpf", "cnpj", "password", "senha", "token", 
-        "api_key", "secret", "authorization", "cookie"
-    }
-    
     sanitized = {}
     
     for key, value in data.items():
         key_lower = key.lower()
         
         # Verifica se é chave sensível
-        if any(sensitive in key_lower for sensitive in sensitive_keys):
+        if _SENSITIVE_KEY_PATTERN.search(key_lower):
             if "cpf" in key_lower:
                 sanitized[f"{key}_masked"] = mask_cpf(str(value))
             elif "cnpj" in key_lower:
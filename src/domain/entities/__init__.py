@@ -12,6 +12,7 @@ from src.domain.entities.parcela import (
 )
 from src.domain.entities.session import Cookie, JWTPayload, Session
 from src.domain.entities.car_bbox import (
+    BRASIL_BBOX,
     StatusImovelSicar,
     TipoImovelSicar,
     UfSicar,
@@ -43,6 +44,7 @@ __all__ = [
     "StatusImovelSicar",
     "TipoImovelSicar",
     "UF_BBOXES",
+    "BRASIL_BBOX",
     "detectar_ufs_por_bbox",
     # INCRA WFS (GeoOne)
     "CamadaIncra",
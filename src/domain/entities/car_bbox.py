@@ -112,6 +112,14 @@ UF_BBOXES: dict[str, tuple[float, float, float, float]] = {
     "TO": (-50.73, -13.47, -45.73, -5.17),
 }
 
+# Envelope de todas as UFs: BBox fora dele não intersecta nenhum estado
+BRASIL_BBOX: tuple[float, float, float, float] = (
+    min(b[0] for b in UF_BBOXES.values()),
+    min(b[1] for b in UF_BBOXES.values()),
+    max(b[2] for b in UF_BBOXES.values()),
+    max(b[3] for b in UF_BBOXES.values()),
+)
+
 
 def detectar_ufs_por_bbox(
     min_lon: float,
@@ -134,6 +142,16 @@ def detectar_ufs_por_bbox(
     Returns:
         Lista de siglas UF que intersectam o BBox (ex: ["SP", "MG"]).
     """
+    # Fora do envelope do Brasil: evita testar as 27 UFs
+    br_min_lon, br_min_lat, br_max_lon, br_max_lat = BRASIL_BBOX
+    if (
+        min_lon > br_max_lon
+        or max_lon < br_min_lon
+        or min_lat > br_max_lat
+        or max_lat < br_min_lat
+    ):
+        return []
+
     ufs_encontradas: list[str] = []
 
     for uf, (uf_min_lon, uf_min_lat, uf_max_lon, uf_max_lat) in UF_BBOXES.items():
@@ -102,16 +102,13 @@ class Session:
         cookies: dict[str, str] = {}
         
         if platform in ("govbr", "all"):
-            for c in self.govbr_cookies:
-                cookies[c.name] = c.value
+            cookies.update({c.name: c.value for c in self.govbr_cookies})
                 
         if platform in ("sigef", "all"):
-            for c in self.sigef_cookies:
-                cookies[c.name] = c.value
+            cookies.update({c.name: c.value for c in self.sigef_cookies})
         
         if platform in ("sicar", "all"):
-            for c in self.sicar_cookies:
-                cookies[c.name] = c.value
+            cookies.update({c.name: c.value for c in self.sicar_cookies})
                 
         return cookies
     
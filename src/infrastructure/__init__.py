@@ -7,9 +7,17 @@ Contém implementações concretas das interfaces do domínio:
 - Clientes HTTP
 """
 
-from src.infrastructure.govbr import PlaywrightGovBrAuthenticator
-from src.infrastructure.persistence import FileSessionRepository, create_new_session
-from src.infrastructure.sigef import HttpSigefClient
+from importlib import import_module
+from typing import Any
+
+# Importação preguiçosa (PEP 562): importar um subpacote
+# (ex.: car_wfs) não deve carregar Playwright
+_LAZY_IMPORTS = {
+    "PlaywrightGovBrAuthenticator": "src.infrastructure.govbr",
+    "HttpSigefClient": "src.infrastructure.sigef",
+    "FileSessionRepository": "src.infrastructure.persistence",
+    "create_new_session": "src.infrastructure.persistence",
+}
 
 __all__ = [
     "PlaywrightGovBrAuthenticator",
@@ -17,3 +25,13 @@ __all__ = [
     "FileSessionRepository",
     "create_new_session",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve exportações sob demanda (primeiro acesso importa o módulo)."""
+    module_path = _LAZY_IMPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_path), name)
+    globals()[name] = value
+    return value
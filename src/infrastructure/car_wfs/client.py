@@ -12,11 +12,11 @@ Limitações conhecidas:
 
 import json
 import ssl
-import urllib.error
 import urllib.parse
-import urllib.request
 from typing import Any
 
+import httpx
+
 from src.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -29,6 +29,10 @@ WFS_OUTPUT_FORMAT = "application/json"
 WFS_TIMEOUT_SECONDS = 60
 WFS_USER_AGENT = "datageoplan-api/1.0"
 
+# Pool keep-alive compartilhado entre consultas (evita handshake TLS por chamada)
+WFS_POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+WFS_CONNECT_RETRIES = 2
+
 # Campos retornados quando geometria não é solicitada
 PROPERTY_NAMES_SEM_GEOMETRIA = (
     "cod_imovel,status_imovel,dat_criacao,area,"
@@ -68,6 +72,19 @@ class CarWfsClient:
         self._url_base = url_base
         self._timeout = timeout
         self._ssl_context = self._criar_ssl_context()
+        self._http = httpx.Client(
+            timeout=timeout,
+            headers={"User-Agent": WFS_USER_AGENT},
+            transport=httpx.HTTPTransport(
+                verify=self._ssl_context,
+                retries=WFS_CONNECT_RETRIES,
+                limits=WFS_POOL_LIMITS,
+            ),
+        )
+
+    def close(self) -> None:
+        """Fecha as conexões do pool HTTP."""
+        self._http.close()
 
     @staticmethod
     def _criar_ssl_context() -> ssl.SSLContext:
@@ -129,14 +146,10 @@ class CarWfsClient:
 
     def _executar_requisicao(self, url: str) -> dict[str, Any]:
         """Executa requisição HTTP ao GeoServer e retorna JSON."""
-        req = urllib.request.Request(url)
-        req.add_header("User-Agent", WFS_USER_AGENT)
-
         try:
-            with urllib.request.urlopen(
-                req, timeout=self._timeout, context=self._ssl_context
-            ) as resp:
-                dados = json.loads(resp.read().decode("utf-8"))
+            resp = self._http.get(url)
+            resp.raise_for_status()
+            dados = json.loads(resp.content)
 
             total = dados.get("totalFeatures", 0)
             retornados = dados.get("numberReturned", len(dados.get("features", [])))
@@ -147,31 +160,27 @@ class CarWfsClient:
             )
             return dados
 
-        except urllib.error.HTTPError as e:
+        except httpx.HTTPStatusError as e:
+            status_code = e.response.status_code
+            reason = e.response.reason_phrase
             logger.error(
                 "Erro HTTP do GeoServer",
-                status_code=e.code,
-                reason=e.reason,
+                status_code=status_code,
+                reason=reason,
             )
             raise GeoServerError(
-                f"GeoServer retornou HTTP {e.code}: {e.reason}",
-                codigo_http=e.code,
-            ) from e
-
-        except urllib.error.URLError as e:
-            if "timed out" in str(e.reason).lower():
-                logger.error("Timeout na conexão com GeoServer")
-                raise GeoServerTimeoutError(
-                    f"GeoServer não respondeu em {self._timeout}s. Tente com um BBox menor."
-                ) from e
-
-            logger.error("Erro de conexão com GeoServer", reason=str(e.reason))
-            raise GeoServerError(
-                f"Não foi possível conectar ao GeoServer: {e.reason}"
+                f"GeoServer retornou HTTP {status_code}: {reason}",
+                codigo_http=status_code,
             ) from e
 
-        except TimeoutError as e:
-            logger.error("Timeout na requisição ao GeoServer")
+        except httpx.TimeoutException as e:
+            logger.error("Timeout na conexão com GeoServer")
             raise GeoServerTimeoutError(
                 f"GeoServer não respondeu em {self._timeout}s. Tente com um BBox menor."
             ) from e
+
+        except httpx.HTTPError as e:
+            logger.error("Erro de conexão com GeoServer", reason=str(e))
+            raise GeoServerError(
+                f"Não foi possível conectar ao GeoServer: {e}"
+            ) from e
@@ -12,11 +12,11 @@ Características:
 
 import json
 import ssl
-import urllib.error
 import urllib.parse
-import urllib.request
 from typing import Any
 
+import httpx
+
 from src.core.logging import get_logger
 from src.domain.entities.incra_wfs import (
     CAMADA_LAYER_MAP,
@@ -33,6 +33,10 @@ WFS_OUTPUT_FORMAT = "application/json"
 WFS_TIMEOUT_SECONDS = 60
 WFS_USER_AGENT = "datageoplan-api/1.0"
 
+# Pool keep-alive compartilhado entre consultas (evita handshake TLS por chamada)
+WFS_POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+WFS_CONNECT_RETRIES = 2
+
 # Camadas SIGEF que suportam PROPERTYNAME otimizado
 _CAMADAS_SIGEF = {"sigef_particular", "sigef_publico"}
 
@@ -69,6 +73,19 @@ class GeoOneWfsClient:
         self._url_base = url_base
         self._timeout = timeout
         self._ssl_context = self._criar_ssl_context()
+        self._http = httpx.Client(
+            timeout=timeout,
+            headers={"User-Agent": WFS_USER_AGENT},
+            transport=httpx.HTTPTransport(
+                verify=self._ssl_context,
+                retries=WFS_CONNECT_RETRIES,
+                limits=WFS_POOL_LIMITS,
+            ),
+        )
+
+    def close(self) -> None:
+        """Fecha as conexões do pool HTTP."""
+        self._http.close()
 
     @staticmethod
     def _criar_ssl_context() -> ssl.SSLContext:
@@ -133,20 +150,16 @@ class GeoOneWfsClient:
 
     def _executar_requisicao(self, url: str) -> dict[str, Any]:
         """Executa requisição HTTP ao GeoOne e retorna JSON."""
-        req = urllib.request.Request(url)
-        req.add_header("User-Agent", WFS_USER_AGENT)
-
         try:
-            with urllib.request.urlopen(
-                req, timeout=self._timeout, context=self._ssl_context
-            ) as resp:
-                content = resp.read()
-                if not content:
-                    raise GeoOneError(
-                        "GeoOne retornou resposta vazia. "
-                        "A camada pode não estar disponível."
-                    )
-                dados = json.loads(content.decode("utf-8"))
+            resp = self._http.get(url)
+            resp.raise_for_status()
+            content = resp.content
+            if not content:
+                raise GeoOneError(
+                    "GeoOne retornou resposta vazia. "
+                    "A camada pode não estar disponível."
+                )
+            dados = json.loads(content)
 
             total = dados.get("totalFeatures", 0)
             retornados = dados.get("numberReturned", len(dados.get("features", [])))
@@ -164,33 +177,28 @@ class GeoOneWfsClient:
                 "A camada pode não suportar o formato solicitado."
             ) from e
 
-        except urllib.error.HTTPError as e:
+        except httpx.HTTPStatusError as e:
+            status_code = e.response.status_code
+            reason = e.response.reason_phrase
             logger.error(
                 "Erro HTTP do GeoOne",
-                status_code=e.code,
-                reason=e.reason,
+                status_code=status_code,
+                reason=reason,
             )
             raise GeoOneError(
-                f"GeoOne retornou HTTP {e.code}: {e.reason}",
-                codigo_http=e.code,
-            ) from e
-
-        except urllib.error.URLError as e:
-            if "timed out" in str(e.reason).lower():
-                logger.error("Timeout na conexão com GeoOne")
-                raise GeoOneTimeoutError(
-                    f"GeoOne não respondeu em {self._timeout}s. "
-                    "Tente com um BBox menor."
-                ) from e
-
-            logger.error("Erro de conexão com GeoOne", reason=str(e.reason))
-            raise GeoOneError(
-                f"Não foi possível conectar ao GeoOne: {e.reason}"
+                f"GeoOne retornou HTTP {status_code}: {reason}",
+                codigo_http=status_code,
             ) from e
 
-        except TimeoutError as e:
-            logger.error("Timeout na requisição ao GeoOne")
+        except httpx.TimeoutException as e:
+            logger.error("Timeout na conexão com GeoOne")
             raise GeoOneTimeoutError(
                 f"GeoOne não respondeu em {self._timeout}s. "
                 "Tente com um BBox menor."
             ) from e
+
+        except httpx.HTTPError as e:
+            logger.error("Erro de conexão com GeoOne", reason=str(e))
+            raise GeoOneError(
+                f"Não foi possível conectar ao GeoOne: {e}"
+            ) from e
@@ -5,12 +5,13 @@ Implementação simples para uso on-premise,
 onde sessões são armazenadas em disco.
 """
 
-import json
 import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 from src.core.config import get_settings
 from src.core.exceptions import SessionExpiredError
 from src.core.logging import get_logger
@@ -157,8 +158,8 @@ class FileSessionRepository(ISessionRepository):
         path = self._get_session_path(session.session_id)
         data = self._session_to_dict(session)
         
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # orjson serializa direto para bytes UTF-8 (sem escape ASCII)
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
         
         logger.info(
             "Sessão salva",
@@ -174,8 +175,7 @@ class FileSessionRepository(ISessionRepository):
             logger.debug("Sessão não encontrada", session_id=session_id)
             return None
         
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = orjson.loads(path.read_bytes())
         
         session = self._dict_to_session(data)
         logger.info("Sessão carregada", session_id=session_id)
@@ -206,8 +206,7 @@ class FileSessionRepository(ISessionRepository):
         
         for path in self.sessions_dir.glob("session_*.json"):
             try:
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                data = orjson.loads(path.read_bytes())
                 sessions.append(self._dict_to_session(data))
             except Exception as e:
                 logger.warning(
@@ -9,6 +9,7 @@ Classes:
 
 import io
 import os
+import logging
 import ssl
 import time
 import random
@@ -38,6 +39,8 @@ from .exceptions import (
     FailedToGetReleaseDateException,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class Sicar(Url):
     """
@@ -273,7 +276,7 @@ class Sicar(Url):
             polygon (Polygon | str): The polygon to download the files. It can be either a `Polygon` enum value or a string representing the polygon's.
             folder (Path | str, optional): The folder path where the downloaded data will be saved. Defaults to "temp".
             tries (int, optional): The number of attempts to download the data. Defaults to 25.
-            debug (bool, optional): Whether to print debug information. Defaults to False.
+            debug (bool, optional): Whether to log debug information (DEBUG level). Defaults to False.
             chunk_size (int, optional): The size of each chunk to download. Defaults to 1024.
 
         Returns:
@@ -307,8 +310,8 @@ class Sicar(Url):
 
                 if len(captcha) == 5:
                     if debug:
-                        print(
-                            f"[{tries:02d}] - Requesting {info} with captcha '{captcha}'"
+                        logger.debug(
+                            "[%02d] - Requesting %s with captcha '%s'", tries, info, captcha
                         )
 
                     return self._download_polygon(
@@ -319,15 +322,15 @@ class Sicar(Url):
                         chunk_size=chunk_size,
                     )
                 elif debug:
-                    print(
-                        f"[{tries:02d}] - Invalid captcha '{captcha}' to request {info}"
+                    logger.debug(
+                        "[%02d] - Invalid captcha '%s' to request %s", tries, captcha, info
                     )
             except (
                 FailedToDownloadCaptchaException,
                 FailedToDownloadPolygonException,
             ) as error:
                 if debug:
-                    print(f"[{tries:02d}] - {error} When requesting {info}")
+                    logger.debug("[%02d] - %s When requesting %s", tries, error, info)
             finally:
                 tries -= 1
                 time.sleep(random.random() + random.random())
@@ -349,7 +352,7 @@ class Sicar(Url):
             polygon (Polygon | str): The polygon to download the files. It can be either a `Polygon` enum value or a string representing the polygon's.
             folder (Path | str, optional): The folder path where the downloaded files will be saved. Defaults to 'brazil'.
             tries (int, optional): The number of download attempts allowed per state. Defaults to 25.
-            debug (bool, optional): Whether to enable debug mode with additional print statements. Defaults to False.
+            debug (bool, optional): Whether to enable debug mode with additional DEBUG log records. Defaults to False.
             chunk_size (int, optional): The size of each chunk to download. Defaults to 1024.
 
         Returns:
@@ -413,7 +416,7 @@ class Sicar(Url):
             car_number (str): The CAR number to download (e.g., "SP-3538709-4861E981046E49BC81720C879459E554").
             folder (Path | str, optional): The folder path where the downloaded data will be saved. Defaults to "temp".
             tries (int, optional): The number of attempts to download the data. Defaults to 25.
-            debug (bool, optional): Whether to print debug information. Defaults to False.
+            debug (bool, optional): Whether to log debug information (DEBUG level). Defaults to False.
             chunk_size (int, optional): The size of each chunk to download. Defaults to 1024.
 
         Returns:
@@ -428,8 +431,8 @@ class Sicar(Url):
         internal_id = property_data.get("id")
         
         if debug:
-            print(f"Property data: {property_data}")
-            print(f"Internal ID: {internal_id}")
+            logger.debug("Property data: %s", property_data)
+            logger.debug("Internal ID: %s", internal_id)
         
         if not internal_id:
             raise Exception(f"Internal ID not found for CAR number: {car_number}")
@@ -447,7 +450,7 @@ class Sicar(Url):
 
                 if len(captcha) == 5:
                     if debug:
-                        print(f"[{tries:02d}] - Requesting {info} with captcha '{captcha}'")
+                        logger.debug("[%02d] - Requesting %s with captcha '%s'", tries, info, captcha)
 
                     return self._download_property_shapefile(
                         internal_id=internal_id,
@@ -458,14 +461,14 @@ class Sicar(Url):
                         debug=debug,
                     )
                 elif debug:
-                    print(f"[{tries:02d}] - Invalid captcha '{captcha}' to request {info}")
+                    logger.debug("[%02d] - Invalid captcha '%s' to request %s", tries, captcha, info)
                     
             except (
                 FailedToDownloadCaptchaException,
                 FailedToDownloadPolygonException,
             ) as error:
                 if debug:
-                    print(f"[{tries:02d}] - {error} When requesting {info}")
+                    logger.debug("[%02d] - %s When requesting %s", tries, error, info)
             finally:
                 tries -= 1
                 time.sleep(random.random() + random.random())
@@ -500,8 +503,8 @@ class Sicar(Url):
         download_url = f"{self._BASE}/imoveis/exportShapeFile?idImovel={internal_id}&ReCaptcha={captcha}"
         
         if debug:
-            print(f"Download URL: {download_url}")
-            print(f"Trying POST method instead of GET...")
+            logger.debug("Download URL: %s", download_url)
+            logger.debug("Trying POST method instead of GET...")
         
         try:
             # Try POST instead of GET (some APIs require POST for downloads)
@@ -516,9 +519,9 @@ class Sicar(Url):
             if response.status_code == 200:
                 # Check if response is base64 data URL
                 content = response.content
-                if response.text.startswith("data:application/zip;base64,"):
+                if content.startswith(b"data:application/zip;base64,"):
                     import base64
-                    base64_data = response.text.split(",", 1)[1]
+                    base64_data = content.split(b",", 1)[1]
                     content = base64.b64decode(base64_data)
                 
                 # POST worked! Save the file
@@ -529,20 +532,20 @@ class Sicar(Url):
                     file.write(content)
                 
                 if debug:
-                    print(f"Downloaded successfully via POST: {len(content)} bytes")
+                    logger.debug("Downloaded successfully via POST: %d bytes", len(content))
                 
                 return file_path
             else:
                 if debug:
-                    print(f"POST failed with status {response.status_code}, trying GET...")
+                    logger.debug("POST failed with status %s, trying GET...", response.status_code)
             
             # Fallback to GET with streaming
             with self._session.stream("GET", download_url) as stream_response:
                 # Check if response is valid
                 if stream_response.status_code != 200:
                     if debug:
-                        print(f"HTTP {stream_response.status_code}")
-                        print(f"Headers: {dict(stream_response.headers)}")
+                        logger.debug("HTTP %s", stream_response.status_code)
+                        logger.debug("Headers: %s", dict(stream_response.headers))
                         try:
                             # Try to read as text
                             content = b""
@@ -551,9 +554,9 @@ class Sicar(Url):
                                 if len(content) > 1000:
                                     break
                             text = content.decode('utf-8', errors='ignore')
-                            print(f"Response (first 500 chars): {text[:500]}")
+                            logger.debug("Response (first 500 chars): %s", text[:500])
                         except Exception as e:
-                            print(f"Could not read response: {e}")
+                            logger.debug("Could not read response: %s", e)
                     raise FailedToDownloadPolygonException()
                 
                 # Generate filename
@@ -589,7 +592,7 @@ class Sicar(Url):
                         file.write(binary_content)
                     
                     if debug:
-                        print(f"Downloaded and decoded base64: {len(binary_content)} bytes")
+                        logger.debug("Downloaded and decoded base64: %d bytes", len(binary_content))
                 else:
                     # Regular binary download
                     total_size = int(stream_response.headers.get("content-length", 0))
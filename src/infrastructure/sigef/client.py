@@ -10,6 +10,7 @@ completar o fluxo OAuth Gov.br -> SIGEF.
 
 import asyncio
 import concurrent.futures
+import os
 import re
 import uuid
 from datetime import datetime
@@ -33,16 +34,32 @@ from src.domain.interfaces import ISigefClient
 
 logger = get_logger(__name__)
 
-# Regex para validar código de parcela SIGEF
-PARCELA_CODE_PATTERN = re.compile(
-    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$",
-    re.IGNORECASE,
-)
+# Pool de conexões para downloads (CSVs da mesma parcela reusam TLS)
+DOWNLOAD_POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=8)
+DOWNLOAD_CONNECT_RETRIES = 3
 
 # ThreadPoolExecutor para Playwright
 _executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="sigef-playwright")
 
 
+def _salvar_download(destino: Path, content: bytes) -> None:
+    """
+    Grava arquivo baixado de forma atômica.
+    
+    Escreve em arquivo temporário e publica com os.replace: quem
+    reaproveita o download (cache do SigefService) nunca lê um
+    arquivo pela metade. As páginas ficam no page cache: o arquivo
+    é lido logo em seguida (FileResponse/ZIP) e reaproveitado.
+    """
+    parcial = destino.with_name(f"{destino.name}.{uuid.uuid4().hex}.part")
+    try:
+        with open(parcial, "wb") as f:
+            f.write(content)
+        os.replace(parcial, destino)
+    finally:
+        parcial.unlink(missing_ok=True)
+
+
 class HttpSigefClient(ISigefClient):
     """
     Cliente SIGEF que usa requisições HTTP diretas.
@@ -54,15 +71,35 @@ class HttpSigefClient(ISigefClient):
     def __init__(self):
         self.settings = get_settings()
         self.base_url = str(self.settings.sigef_base_url).rstrip("/")
+        
+        # Headers pré-computados (base_url é fixo por instância)
+        self._default_headers: dict[str, str] = {
+            "User-Agent": (
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/120.0.0.0 Safari/537.36"
+            ),
+            "Accept": "text/csv,text/plain,*/*",
+            "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+            "Referer": f"{self.base_url}/",
+        }
+        self._referer_parcela_prefix = f"{self.base_url}/geo/parcela/detalhe/"
+        
+        # Requisições simultâneas ao SIGEF (CSVs e memoriais), somando
+        # todas as requisições da API: evita rate limiting no upstream
+        self._upstream_limite = asyncio.Semaphore(self.settings.sigef_max_concurrency)
     
     def _validate_parcela_code(self, codigo: str) -> str:
-        """Valida e normaliza código de parcela."""
-        codigo = codigo.strip().lower()
-        
-        if not PARCELA_CODE_PATTERN.match(codigo):
-            raise InvalidParcelaCodeError(codigo)
+        """
+        Valida e normaliza código de parcela.
         
-        return codigo
+        uuid.UUID (parser em C) em vez de regex; devolve a forma
+        canônica: minúsculas, com hífens.
+        """
+        try:
+            return str(uuid.UUID(codigo.strip()))
+        except ValueError:
+            raise InvalidParcelaCodeError(codigo) from None
     
     def _build_cookies_dict(self, session: Session) -> dict[str, str]:
         """Constrói dicionário de cookies para requisições."""
@@ -73,18 +110,11 @@ class HttpSigefClient(ISigefClient):
         
         return cookies
     
-    def _get_headers(self) -> dict[str, str]:
-        """Retorna headers padrão para requisições."""
-        return {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
-            "Accept": "text/csv,text/plain,*/*",
-            "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Referer": f"{self.base_url}/",
-        }
+    def _get_parcela_headers(self, codigo: str) -> dict[str, str]:
+        """Retorna headers com Referer específico da parcela (importante para SIGEF)."""
+        headers = dict(self._default_headers)
+        headers["Referer"] = self._referer_parcela_prefix + codigo + "/"
+        return headers
     
     async def authenticate(self, govbr_session: Session) -> Session:
         """
@@ -318,7 +348,7 @@ class HttpSigefClient(ISigefClient):
             follow_redirects=True,
             timeout=30.0,
             cookies=cookies,
-            headers=self._get_headers(),
+            headers=self._default_headers,
         ) as client:
             url = f"{self.base_url}/geo/parcela/detalhe/{codigo}/"
             response = await client.get(url)
@@ -425,7 +455,7 @@ class HttpSigefClient(ISigefClient):
             follow_redirects=True,
             timeout=30.0,
             cookies=cookies,
-            headers=self._get_headers(),
+            headers=self._default_headers,
         ) as client:
             url = f"{self.base_url}/geo/parcela/detalhe/{codigo}/"
             logger.info(f"Buscando detalhes da parcela em: {url}")
@@ -599,11 +629,33 @@ class HttpSigefClient(ISigefClient):
             
             return detalhes
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        reraise=True,
-    )
+    def _create_download_client(
+        self,
+        codigo: str,
+        session: Session,
+    ) -> httpx.AsyncClient:
+        """
+        Cria cliente HTTP para downloads de uma parcela.
+        
+        O pool de conexões permite reaproveitar DNS/TCP/TLS entre
+        os CSVs da mesma parcela; o transporte refaz tentativas
+        de conexão em falhas transitórias.
+        """
+        cookies = self._build_cookies_dict(session)
+        
+        headers = self._get_parcela_headers(codigo)
+        
+        return httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=60.0,
+            cookies=cookies,
+            headers=headers,
+            transport=httpx.AsyncHTTPTransport(
+                retries=DOWNLOAD_CONNECT_RETRIES,
+                limits=DOWNLOAD_POOL_LIMITS,
+            ),
+        )
+    
     async def download_csv(
         self,
         codigo: str,
@@ -619,6 +671,22 @@ class HttpSigefClient(ISigefClient):
         """
         codigo = self._validate_parcela_code(codigo)
         
+        async with self._create_download_client(codigo, session) as client:
+            return await self._baixar_csv(client, codigo, tipo, destino)
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        reraise=True,
+    )
+    async def _baixar_csv(
+        self,
+        client: httpx.AsyncClient,
+        codigo: str,
+        tipo: TipoExportacao,
+        destino: Path | None = None,
+    ) -> Path:
+        """Baixa um CSV usando um cliente já configurado para a parcela."""
         # Monta URL de download
         url = f"{self.base_url}/geo/exportar/{tipo.value}/csv/{codigo}/"
         
@@ -628,20 +696,9 @@ class HttpSigefClient(ISigefClient):
             codigo=codigo,
         )
         
-        cookies = self._build_cookies_dict(session)
-        
-        # Headers com Referer específico da parcela (importante para SIGEF)
-        headers = self._get_headers()
-        headers["Referer"] = f"{self.base_url}/geo/parcela/detalhe/{codigo}/"
-        
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=60.0,
-            cookies=cookies,
-            headers=headers,
-        ) as client:
-            response = await client.get(url)
-            
+        async with self._upstream_limite, client.stream("GET", url) as response:
+            # Status e Content-Type são validados só pelos headers:
+            # sessão inválida não chega a transferir/bufferizar o corpo
             if response.status_code == 404:
                 raise ParcelaNotFoundError(codigo)
             
@@ -663,26 +720,28 @@ class HttpSigefClient(ISigefClient):
                     "Sessão inválida. Recebido HTML ao invés de CSV."
                 )
             
-            # Define destino
-            if destino is None:
-                downloads_dir = self.settings.downloads_dir
-                downloads_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Nome: codigo_tipo.csv
-                filename = f"{codigo}_{tipo.value}.csv"
-                destino = downloads_dir / filename
-            
-            # Salva arquivo
-            destino.write_bytes(response.content)
-            
-            logger.info(
-                "CSV baixado com sucesso",
-                tipo=tipo.value,
-                destino=str(destino),
-                tamanho_bytes=len(response.content),
-            )
+            content = await response.aread()
+        
+        # Define destino
+        if destino is None:
+            downloads_dir = self.settings.downloads_dir
+            downloads_dir.mkdir(parents=True, exist_ok=True)
             
-            return destino
+            # Nome: codigo_tipo.csv
+            filename = f"{codigo}_{tipo.value}.csv"
+            destino = downloads_dir / filename
+        
+        # Salva arquivo
+        _salvar_download(destino, content)
+        
+        logger.info(
+            "CSV baixado com sucesso",
+            tipo=tipo.value,
+            destino=str(destino),
+            tamanho_bytes=len(content),
+        )
+        
+        return destino
     
     async def download_all_csvs(
         self,
@@ -693,33 +752,42 @@ class HttpSigefClient(ISigefClient):
         """
         Baixa todos os CSVs de uma parcela.
         
-        Faz downloads em sequência para evitar rate limiting.
+        Os tipos são baixados em paralelo, sobre o mesmo cliente
+        (pool keep-alive), sem ultrapassar o limite compartilhado de
+        requisições ao SIGEF (rate limiting). Se um tipo falhar, os
+        demais downloads são cancelados.
         """
         codigo = self._validate_parcela_code(codigo)
         destino_dir = destino_dir or self.settings.downloads_dir
         destino_dir.mkdir(parents=True, exist_ok=True)
         
-        results: dict[TipoExportacao, Path] = {}
-        
-        for tipo in TipoExportacao:
-            destino = destino_dir / f"{codigo}_{tipo.value}.csv"
+        async with self._create_download_client(codigo, session) as client:
+            
+            async def baixar(tipo: TipoExportacao) -> Path:
+                destino = destino_dir / f"{codigo}_{tipo.value}.csv"
+                try:
+                    return await self._baixar_csv(client, codigo, tipo, destino)
+                except Exception as e:
+                    logger.error(
+                        "Falha ao baixar CSV",
+                        tipo=tipo.value,
+                        codigo=codigo,
+                        error=str(e),
+                    )
+                    raise
             
             try:
-                path = await self.download_csv(
-                    codigo=codigo,
-                    tipo=tipo,
-                    session=session,
-                    destino=destino,
-                )
-                results[tipo] = path
-            except Exception as e:
-                logger.error(
-                    "Falha ao baixar CSV",
-                    tipo=tipo.value,
-                    codigo=codigo,
-                    error=str(e),
-                )
-                raise
+                async with asyncio.TaskGroup() as tg:
+                    tarefas = {
+                        tipo: tg.create_task(baixar(tipo)) for tipo in TipoExportacao
+                    }
+            except ExceptionGroup as eg:
+                # Mantém as exceções de domínio (ex.: reautenticação)
+                raise eg.exceptions[0]
+        
+        results: dict[TipoExportacao, Path] = {
+            tipo: tarefa.result() for tipo, tarefa in tarefas.items()
+        }
         
         logger.info(
             "Todos os CSVs baixados",
@@ -757,9 +825,7 @@ class HttpSigefClient(ISigefClient):
         
         cookies = self._build_cookies_dict(session)
         
-        # Headers com Referer específico da parcela (importante para SIGEF)
-        headers = self._get_headers()
-        headers["Referer"] = f"{self.base_url}/geo/parcela/detalhe/{codigo}/"
+        headers = self._get_parcela_headers(codigo)
         headers["Accept"] = "text/html,application/xhtml+xml,application/xml;q=0.9,application/pdf,*/*"
         
         async with httpx.AsyncClient(
@@ -768,7 +834,8 @@ class HttpSigefClient(ISigefClient):
             cookies=cookies,
             headers=headers,
         ) as client:
-            response = await client.get(url)
+            async with self._upstream_limite:
+                response = await client.get(url)
             
             if response.status_code == 404:
                 raise ParcelaNotFoundError(codigo)
@@ -801,7 +868,7 @@ class HttpSigefClient(ISigefClient):
                 destino = downloads_dir / filename
             
             # Salva arquivo
-            destino.write_bytes(response.content)
+            _salvar_download(destino, response.content)
             
             logger.info(
                 "Memorial descritivo baixado com sucesso",
@@ -12,16 +12,19 @@ from datetime import datetime
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from src.api.v1 import router as v1_router
+from src.api.v1.dependencies import close_http_clients, verify_api_key
+from src.api.middleware.compression import CompressionMiddleware
 from src.api.middleware.ratelimit import get_limiter
 from src.api.middleware.security import SecurityHeadersMiddleware
 from src.core.config import get_settings
 from src.core.exceptions import GovAuthException
 from src.core.logging import get_logger, setup_logging
+from src.services.sicar_service import shutdown_captcha_pool
 
 # Fix para Windows: Playwright precisa de ProactorEventLoop para criar subprocessos
 if sys.platform == "win32":
@@ -62,6 +65,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Encerrando Gov.br Auth API")
+    close_http_clients()
+    shutdown_captcha_pool()
 
 
 def create_app() -> FastAPI:
@@ -183,12 +188,17 @@ curl -X POST http://localhost:8000/api/sicar/stream/state \\
     # API Key é validada via dependência explícita nos endpoints (RequireAPIKey)
     # Não usamos mais middleware global
     
+    # Em desenvolvimento, resolve a dependência com constante
+    # (evita corrotina + extração do header a cada requisição)
+    if settings.is_development:
+        app.dependency_overrides[verify_api_key] = lambda: "dev-mode"
+    
     # Exception handlers
     @app.exception_handler(GovAuthException)
     async def govauth_exception_handler(request: Request, exc: GovAuthException):
         """Handler para exceções do domínio."""
         return JSONResponse(
-            status_code=exc.status_code if hasattr(exc, "status_code") else 500,
+            status_code=exc.status_code,
             content={
                 "error": exc.__class__.__name__,
                 "detail": str(exc),
@@ -198,14 +208,9 @@ curl -X POST http://localhost:8000/api/sicar/stream/state \\
     # Rotas da API
     app.include_router(v1_router, prefix="/api")
     
-    # Middleware para CSS dark mode no Swagger UI
-    from starlette.middleware.base import BaseHTTPMiddleware
-    from starlette.responses import Response
-    
-    class SwaggerContrastMiddleware(BaseHTTPMiddleware):
-            """Injeta CSS dark mode no Swagger UI."""
-            
-            CUSTOM_CSS = """
+    # CSS dark mode do Swagger UI: injetado direto na rota /docs,
+    # sem middleware interceptando todas as requisições
+    SWAGGER_DARK_CSS = """
 <style>
 /* ========== MINIMAL DARK MODE ========== */
 
@@ -634,51 +639,25 @@ html, body {
 }
 </style>
 """
-            
-            async def dispatch(self, request, call_next):
-                response = await call_next(request)
-                
-                # Injeta CSS apenas na página /docs
-                if request.url.path == "/docs" and response.status_code == 200:
-                    body = b""
-                    async for chunk in response.body_iterator:
-                        body += chunk
-                    
-                    # Injeta CSS antes do </head>
-                    body_str = body.decode()
-                    body_str = body_str.replace(
-                        "</head>",
-                        f"{self.CUSTOM_CSS}</head>"
-                    )
-                    
-                    # Remove Content-Length dos headers originais (será recalculado)
-                    new_headers = {
-                        k: v for k, v in response.headers.items()
-                        if k.lower() != "content-length"
-                    }
-                    
-                    return Response(
-                        content=body_str,
-                        status_code=response.status_code,
-                        headers=new_headers,
-                        media_type="text/html",
-                    )
-                
-                return response
     
-    app.add_middleware(SwaggerContrastMiddleware)
+    # Compressão gzip de respostas textuais (JSON/SLD/HTML)
+    # Registrado por último (mais externo)
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, compresslevel=5)
     
     # Rota de página HTML de autenticação
     from src.api.v1.static.auth_page import HTML_AUTH_PAGE
     from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
     
+    # HTML do Swagger é estático: monta uma vez, já com o CSS injetado
+    swagger_html = get_swagger_ui_html(
+        openapi_url="openapi.json",
+        title="Gov.br Auth API - Docs",
+    ).body.decode().replace("</head>", f"{SWAGGER_DARK_CSS}</head>")
+    
     @app.get("/docs", include_in_schema=False)
     async def swagger_ui():
         """Swagger UI."""
-        return get_swagger_ui_html(
-            openapi_url="openapi.json",
-            title="Gov.br Auth API - Docs",
-        )
+        return HTMLResponse(content=swagger_html)
     
     @app.get("/redoc", include_in_schema=False)
     async def redoc():
@@ -691,7 +670,6 @@ html, body {
     @app.get("/auth-browser", tags=["Autenticação"])
     async def auth_browser_page():
         """Página HTML de autenticação do navegador do cliente."""
-        from fastapi.responses import HTMLResponse
         return HTMLResponse(content=HTML_AUTH_PAGE)
     
     # Health check
@@ -734,4 +712,9 @@ if __name__ == "__main__":
         port=settings.port,
         reload=settings.debug,
         log_level=settings.log_level.lower(),
+        # Loop libuv e parser HTTP em C (uvloop não existe no Windows)
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        # Log de acesso só em debug: rotas já registram eventos via structlog
+        access_log=settings.debug,
     )
@@ -5,6 +5,10 @@ Orquestra o fluxo de autenticação Gov.br e SIGEF,
 gerenciando sessões e validações.
 """
 
+from datetime import datetime
+
+from src.core.cache import TTLCache
+from src.core.config import get_settings
 from src.core.exceptions import SessionExpiredError
 from src.core.logging import get_logger
 from src.core.security import mask_cpf
@@ -13,6 +17,9 @@ from src.domain.interfaces import IGovBrAuthenticator, ISessionRepository, ISige
 
 logger = get_logger(__name__)
 
+# Chave da sessão mais recente já validada no cache
+_LATEST_SESSION_KEY = "latest"
+
 
 class AuthService:
     """
@@ -30,6 +37,7 @@ class AuthService:
         govbr_authenticator: IGovBrAuthenticator,
         sigef_client: ISigefClient,
         session_repository: ISessionRepository,
+        session_cache_ttl: float | None = None,
     ):
         """
         Inicializa serviço com dependências injetadas.
@@ -38,10 +46,49 @@ class AuthService:
             govbr_authenticator: Implementação de autenticação Gov.br
             sigef_client: Cliente SIGEF
             session_repository: Repositório de sessões
+            session_cache_ttl: Segundos que uma sessão validada fica em
+                              memória (padrão: settings).
         """
         self.govbr = govbr_authenticator
         self.sigef = sigef_client
         self.sessions = session_repository
+        
+        # Sessões já validadas: evita disco + Gov.br a cada requisição
+        if session_cache_ttl is None:
+            session_cache_ttl = get_settings().auth_session_cache_ttl_seconds
+        self._session_cache = TTLCache(maxsize=128, ttl=session_cache_ttl)
+        
+        # Incrementada a cada sessão criada/removida: validações iniciadas
+        # antes da troca não repovoam o cache com a sessão antiga
+        self._geracao = 0
+    
+    def _invalidar_sessoes(self) -> None:
+        """Descarta sessões em cache após criar ou remover uma sessão."""
+        self._geracao += 1
+        self._session_cache.clear()
+    
+    def _get_cached_session(self) -> Session | None:
+        """Retorna sessão validada recentemente, se ainda não expirou."""
+        session = self._session_cache.get(_LATEST_SESSION_KEY)
+        if session is not None and session.is_expired():
+            self._session_cache.delete(_LATEST_SESSION_KEY)
+            return None
+        return session
+    
+    def _cache_session(self, session: Session, geracao: int | None = None) -> None:
+        """
+        Guarda sessão validada (TTL limitado à expiração da sessão).
+        
+        Com `geracao`, só guarda se nenhuma sessão foi criada ou
+        removida desde que a validação começou.
+        """
+        if geracao is not None and geracao != self._geracao:
+            return
+        ttl = None
+        if session.expires_at:
+            remaining = (session.expires_at - datetime.now()).total_seconds()
+            ttl = min(self._session_cache.ttl, remaining)
+        self._session_cache.set(_LATEST_SESSION_KEY, session, ttl=ttl)
     
     async def get_or_create_session(self, force_new: bool = False) -> Session:
         """
@@ -54,7 +101,12 @@ class AuthService:
             Sessão autenticada no Gov.br e SIGEF.
         """
         if not force_new:
+            cached = self._get_cached_session()
+            if cached:
+                return cached
+            
             # Tenta carregar sessão existente
+            geracao = self._geracao
             session = await self.sessions.load_latest()
             
             if session and session.is_valid():
@@ -68,6 +120,7 @@ class AuthService:
                 if await self.govbr.validate_session(session):
                     session.touch()
                     await self.sessions.save(session)
+                    self._cache_session(session, geracao)
                     return session
                 
                 logger.info("Sessão existente inválida, criando nova")
@@ -97,8 +150,10 @@ class AuthService:
         session = await self.sigef.authenticate(session)
         logger.info("SIGEF autenticado")
         
-        # 3. Persiste
+        # 3. Persiste (nova sessão passa a ser a mais recente)
         await self.sessions.save(session)
+        self._invalidar_sessoes()
+        self._cache_session(session)
         logger.info("Sessão persistida", session_id=session.session_id)
         
         return session
@@ -110,6 +165,11 @@ class AuthService:
         Returns:
             Tupla (is_valid, session). Session é None se inválida.
         """
+        cached = self._get_cached_session()
+        if cached:
+            return True, cached
+        
+        geracao = self._geracao
         session = await self.sessions.load_latest()
         
         if not session:
@@ -124,6 +184,7 @@ class AuthService:
         if is_valid:
             session.touch()
             await self.sessions.save(session)
+            self._cache_session(session, geracao)
             return True, session
         
         return False, None
@@ -143,6 +204,9 @@ class AuthService:
             if session:
                 await self.sessions.delete(session.session_id)
         
+        # Após a remoção: validações concorrentes não recolocam a sessão
+        self._invalidar_sessoes()
+        
         logger.info("Sessão encerrada", session_id=session_id)
     
     async def create_session_from_browser_auth(
@@ -231,8 +295,9 @@ class AuthService:
         session.is_govbr_authenticated = len(govbr_cookie_objs) > 0
         session.is_sigef_authenticated = len(sigef_cookie_objs) > 0
         
-        # Persiste
+        # Persiste (nova sessão passa a ser a mais recente)
         await self.sessions.save(session)
+        self._invalidar_sessoes()
         
         logger.info(
             f"Sessão criada via browser auth",
@@ -249,7 +314,7 @@ class AuthService:
         Returns:
             Dicionário com dados do usuário ou None.
         """
-        session = await self.sessions.load_latest()
+        session = self._get_cached_session() or await self.sessions.load_latest()
         
         if not session:
             return None
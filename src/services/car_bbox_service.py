@@ -85,6 +85,9 @@ class CarBboxService:
     # busca N vezes mais features para garantir resultados após filtragem
     _FATOR_FILTRO = 10
 
+    # Máximo de UFs consultadas simultaneamente no GeoServer
+    _MAX_UFS_PARALELAS = 8
+
     def __init__(self, wfs_client: CarWfsClient) -> None:
         self._wfs_client = wfs_client
 
@@ -94,6 +97,7 @@ class CarBboxService:
         max_resultados: int = 50,
         status: StatusImovelSicar | None = None,
         tipo_imovel: TipoImovelSicar | None = None,
+        ufs: list[str] | None = None,
     ) -> ConsultaCarBboxResultado:
         """
         Consulta CARs dentro de um Bounding Box.
@@ -107,6 +111,7 @@ class CarBboxService:
             max_resultados: Máximo de imóveis a retornar (1-5000).
             status: Filtro por status do cadastro (aplicado client-side).
             tipo_imovel: Filtro por tipo de imóvel (aplicado client-side).
+            ufs: UFs já detectadas pelo chamador (se None, detecta pelo BBox).
 
         Returns:
             ConsultaCarBboxResultado com os imóveis encontrados.
@@ -115,13 +120,14 @@ class CarBboxService:
             CarBboxServiceError: Erro na consulta ou processamento.
         """
         # Auto-detectar UFs a partir do BBox
-        coords = bbox_wfs.split(",")
-        ufs = detectar_ufs_por_bbox(
-            min_lon=float(coords[0]),
-            min_lat=float(coords[1]),
-            max_lon=float(coords[2]),
-            max_lat=float(coords[3]),
-        )
+        if ufs is None:
+            coords = bbox_wfs.split(",")
+            ufs = detectar_ufs_por_bbox(
+                min_lon=float(coords[0]),
+                min_lat=float(coords[1]),
+                max_lon=float(coords[2]),
+                max_lat=float(coords[3]),
+            )
 
         if not ufs:
             raise CarBboxServiceError(
@@ -140,37 +146,46 @@ class CarBboxService:
             max_resultados * self._FATOR_FILTRO if tem_filtros else max_resultados
         )
 
-        # Consultar cada UF detectada e agregar resultados
+        # Consultar as UFs detectadas em paralelo e agregar resultados
+        semaforo = asyncio.Semaphore(self._MAX_UFS_PARALELAS)
+
+        async def consultar_uf(uf: str) -> dict[str, Any] | None:
+            async with semaforo:
+                try:
+                    return await self._chamar_wfs(
+                        bbox_wfs=bbox_wfs,
+                        uf=uf,
+                        max_features=max_features_wfs,
+                        com_geometria=False,
+                    )
+                except GeoServerTimeoutError as e:
+                    raise CarBboxServiceError(
+                        mensagem=str(e),
+                        codigo="GEOSERVER_TIMEOUT",
+                    ) from e
+                except GeoServerError as e:
+                    # Se uma UF falhar, logar e continuar com as demais
+                    logger.warning(
+                        "Erro ao consultar UF no GeoServer",
+                        uf=uf,
+                        erro=str(e),
+                    )
+                    return None
+
+        respostas = await asyncio.gather(*(consultar_uf(uf) for uf in ufs))
+
         todas_features: list[dict[str, Any]] = []
         total_encontrados_global = 0
 
-        for uf in ufs:
-            try:
-                geojson = await self._chamar_wfs(
-                    bbox_wfs=bbox_wfs,
-                    uf=uf,
-                    max_features=max_features_wfs,
-                    com_geometria=False,
-                )
-                features = geojson.get("features", [])
-                total_geoserver = geojson.get("totalFeatures", len(features))
-                total_encontrados_global += (
-                    total_geoserver if isinstance(total_geoserver, int) else len(features)
-                )
-                todas_features.extend(features)
-            except GeoServerTimeoutError as e:
-                raise CarBboxServiceError(
-                    mensagem=str(e),
-                    codigo="GEOSERVER_TIMEOUT",
-                ) from e
-            except GeoServerError as e:
-                # Se uma UF falhar, logar e continuar com as demais
-                logger.warning(
-                    "Erro ao consultar UF no GeoServer",
-                    uf=uf,
-                    erro=str(e),
-                )
+        for geojson in respostas:
+            if geojson is None:
                 continue
+            features = geojson.get("features", [])
+            total_geoserver = geojson.get("totalFeatures", len(features))
+            total_encontrados_global += (
+                total_geoserver if isinstance(total_geoserver, int) else len(features)
+            )
+            todas_features.extend(features)
 
         return self._processar_features(
             features=todas_features,
@@ -7,6 +7,7 @@ do sistema car.gov.br e gera PDF do demonstrativo.
 
 import ssl
 import io
+import threading
 from typing import Dict, Any, Optional
 
 import httpx
@@ -33,13 +34,27 @@ class CarConsultaService:
     detalhadas de um registro CAR.
     """
 
-    def __init__(self):
-        """Inicializa o serviço com sessão HTTP configurada para TLS do car.gov.br."""
+    def __init__(self) -> None:
+        """
+        Inicializa o serviço com sessão HTTP configurada para TLS do car.gov.br.
+
+        A instância é compartilhada entre requisições (singleton): a sessão
+        mantém conexões keep-alive e evita novo handshake TLS por consulta.
+        """
         self._session: Optional[httpx.Client] = None
+        # Consultas rodam em várias threads (asyncio.to_thread): sem o lock,
+        # duas poderiam criar clientes e um deles vazaria
+        self._session_lock = threading.Lock()
 
     def _get_session(self) -> httpx.Client:
         """Cria ou retorna sessão HTTP com TLS configurado."""
-        if self._session is None:
+        session = self._session
+        if session is not None:
+            return session
+        with self._session_lock:
+            if self._session is not None:
+                return self._session
+
             context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
             context.set_ciphers("RSA+AESGCM:RSA+AES:!aNULL:!MD5:!DSS")
 
@@ -50,10 +65,9 @@ class CarConsultaService:
                     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
                     "Accept": "application/json, text/plain, */*",
                     "Accept-Encoding": "gzip, deflate, br",
-                    "Connection": "close",
                 },
             )
-        return self._session
+            return self._session
 
     def consultar_demonstrativo(self, car_code: str) -> Dict[str, Any]:
         """
@@ -231,13 +245,12 @@ class CarConsultaService:
         """
         return _gerar_pdf(dados)
 
-    def __del__(self):
-        """Fecha sessão HTTP."""
-        if self._session:
-            try:
-                self._session.close()
-            except Exception:
-                pass
+    def close(self) -> None:
+        """Fecha sessão HTTP e libera o pool de conexões."""
+        with self._session_lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
 
 
 # ====================================================================
@@ -83,6 +83,28 @@ class IncraBboxServiceError(Exception):
 _CAMADAS_SIGEF = {CamadaIncra.SIGEF_PARTICULAR, CamadaIncra.SIGEF_PUBLICO}
 
 
+# A resposta é serializada direto das dataclasses (sem validação Pydantic):
+# propriedades do WFS são normalizadas aqui para os tipos do schema,
+# já que o GeoServer pode devolver null ou números em campos de texto
+
+def _texto(valor: Any) -> str:
+    """Converte propriedade WFS em str (null vira "")."""
+    return "" if valor is None else str(valor)
+
+
+def _texto_opcional(valor: Any) -> str | None:
+    """Converte propriedade WFS em str, preservando null."""
+    return None if valor is None else str(valor)
+
+
+def _inteiro(valor: Any) -> int:
+    """Converte propriedade WFS em int (null ou inválido vira 0)."""
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return 0
+
+
 class IncraBboxService:
     """
     Serviço para consulta de parcelas INCRA por Bounding Box.
@@ -204,33 +226,32 @@ class IncraBboxService:
         feature: dict[str, Any],
     ) -> ParcelaIncraResultado:
         """Converte feature GeoJSON SIGEF em ParcelaIncraResultado."""
-        props = feature.get("properties", {})
-        uf_id = props.get("uf_id")
-        uf_sigla = UF_ID_PARA_SIGLA.get(int(uf_id), "") if uf_id is not None else ""
+        props = feature.get("properties") or {}
+        uf_sigla = UF_ID_PARA_SIGLA.get(_inteiro(props.get("uf_id")), "")
 
         # Limpar datas (remover 'Z' se presente)
-        data_submi = props.get("data_submi")
-        if isinstance(data_submi, str):
+        data_submi = _texto_opcional(props.get("data_submi"))
+        if data_submi is not None:
             data_submi = data_submi.rstrip("Z")
 
-        data_aprov = props.get("data_aprov")
-        if isinstance(data_aprov, str):
+        data_aprov = _texto_opcional(props.get("data_aprov"))
+        if data_aprov is not None:
             data_aprov = data_aprov.rstrip("Z")
 
         return ParcelaIncraResultado(
-            id=feature.get("id", ""),
-            parcela_codigo=props.get("parcela_codigo", ""),
-            codigo_imovel=props.get("codigo_imo", ""),
-            nome_area=props.get("nome_area", ""),
-            status=props.get("status", ""),
-            situacao=props.get("situacao_i", ""),
-            rt=props.get("rt", ""),
-            art=props.get("art", ""),
+            id=_texto(feature.get("id")),
+            parcela_codigo=_texto(props.get("parcela_codigo")),
+            codigo_imovel=_texto(props.get("codigo_imo")),
+            nome_area=_texto(props.get("nome_area")),
+            status=_texto(props.get("status")),
+            situacao=_texto(props.get("situacao_i")),
+            rt=_texto(props.get("rt")),
+            art=_texto(props.get("art")),
             data_submissao=data_submi,
             data_aprovacao=data_aprov,
-            registro_matricula=props.get("registro_m"),
-            registro_destaque=props.get("registro_d"),
-            municipio_ibge=props.get("municipio_", 0),
+            registro_matricula=_texto_opcional(props.get("registro_m")),
+            registro_destaque=_texto_opcional(props.get("registro_d")),
+            municipio_ibge=_inteiro(props.get("municipio_")),
             uf=uf_sigla,
         )
 
@@ -240,6 +261,6 @@ class IncraBboxService:
     ) -> FeatureGenericaResultado:
         """Converte feature GeoJSON genérica."""
         return FeatureGenericaResultado(
-            id=feature.get("id", ""),
-            propriedades=feature.get("properties", {}),
+            id=_texto(feature.get("id")),
+            propriedades=feature.get("properties") or {},
         )
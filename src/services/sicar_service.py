@@ -6,16 +6,32 @@ sem persistência em banco de dados.
 """
 
 import os
+import asyncio
+import concurrent.futures
+import functools
 import logging
-import io
+import multiprocessing
+import threading
 import time
 import random
 import base64
-from typing import Tuple
+import uuid
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from collections.abc import Hashable
+from typing import Any, Callable, Iterator, Literal, Tuple, get_args
 
+from src.core.cache import SingleFlight
+from src.core.config import get_settings
 from src.infrastructure.sicar_package.SICAR import Sicar, State, Polygon
 from src.infrastructure.sicar_package.SICAR.drivers import Tesseract
 
+# Tamanho dos blocos no download streaming (64 KB)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Prefixo de data URL base64 (comparado em bytes, sem decodificar o corpo)
+_BASE64_ZIP_PREFIX = b"data:application/zip;base64,"
+
 # Configurar pytesseract para Windows
 try:
     import pytesseract
@@ -27,25 +43,238 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Pool dedicado: downloads SICAR bloqueiam por 10-60s (captcha + HTTP síncrono)
+# e não podem ocupar o event loop nem o executor padrão da aplicação
+_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=8,
+    thread_name_prefix="sicar",
+)
+
+# Pool de processos para o OCR do captcha (CPU): não disputa o GIL com
+# o servidor e uma falha no OCR não derruba o processo da API.
+# Criado sob demanda (o import do módulo não sobe processos).
+# Sempre "spawn": o pool nasce em threads do _executor, e um fork de
+# processo multithread pode herdar locks travados (logging, ssl, sessões)
+_captcha_pool: concurrent.futures.ProcessPoolExecutor | None = None
+_captcha_pool_lock = threading.Lock()
+
+
+def _get_captcha_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """Retorna o pool de OCR, criando-o no primeiro uso."""
+    global _captcha_pool
+    with _captcha_pool_lock:
+        if _captcha_pool is None:
+            _captcha_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _captcha_pool
+
+
+def _descartar_captcha_pool(pool: concurrent.futures.ProcessPoolExecutor) -> None:
+    """Descarta um pool quebrado (o próximo uso cria outro)."""
+    global _captcha_pool
+    with _captcha_pool_lock:
+        if _captcha_pool is pool:
+            _captcha_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_captcha_pool() -> None:
+    """Encerra o pool de OCR (shutdown da aplicação)."""
+    global _captcha_pool
+    with _captcha_pool_lock:
+        pool, _captcha_pool = _captcha_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _ocr_captcha(captcha: Any) -> str:
+    """Reconhece o texto do captcha (executado em processo do pool)."""
+    return Tesseract().get_captcha(captcha)
+
+
+def _iterar_e_fechar(response: Any, chunk_size: int) -> Iterator[bytes]:
+    """Itera o corpo de uma resposta httpx em streaming e a fecha ao final."""
+    try:
+        yield from response.iter_bytes(chunk_size)
+    finally:
+        response.close()
+
 
 class SicarService:
     """
     Serviço para download streaming de shapefiles do SICAR.
     
     Esta versão faz apenas streaming direto, sem persistência em banco.
+    
+    Pode ser compartilhado entre requisições: cada thread usa seu próprio
+    cliente Sicar (o captcha é vinculado à sessão HTTP), reaproveitado
+    entre downloads da mesma thread.
+    
+    Shapefiles por estado são mantidos em cache em disco: o SICAR os
+    atualiza no máximo mensalmente e cada download custa 10-60s.
     """
 
-    def __init__(self, driver: str = "tesseract"):
+    def __init__(
+        self,
+        driver: str = "tesseract",
+        cache_dir: Path | None = None,
+        cache_ttl_seconds: float | None = None,
+    ):
         """
         Inicializa o serviço SICAR.
         
         Args:
             driver: Driver de OCR para captcha ("tesseract" ou "paddle")
+            cache_dir: Diretório do cache de shapefiles por estado
+            cache_ttl_seconds: Validade dos arquivos em cache
         """
-        # Por enquanto só suportamos Tesseract
-        self.sicar = Sicar(driver=Tesseract)
+        settings = get_settings()
+        self.driver = driver
+        self.cache_dir = cache_dir or settings.downloads_dir / "sicar"
+        self.cache_ttl_seconds = (
+            settings.sicar_state_cache_ttl_seconds
+            if cache_ttl_seconds is None
+            else cache_ttl_seconds
+        )
+        self._local = threading.local()
+        self._single_flight = SingleFlight()
+        # Downloads por estado em andamento (usado apenas no event loop)
+        self._downloads_estado: dict[Hashable, asyncio.Event] = {}
         logger.debug(f"SicarService inicializado com driver: {driver}")
 
+    async def run_in_executor(self, func: Callable[..., Any], /, *args, **kwargs) -> Any:
+        """
+        Executa um método síncrono do serviço no pool SICAR.
+        
+        Libera o event loop durante o download/processamento.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _executor,
+            functools.partial(func, *args, **kwargs),
+        )
+
+    async def run_single_flight(
+        self,
+        key: Hashable,
+        func: Callable[..., Any],
+        /,
+        *args,
+        **kwargs,
+    ) -> Any:
+        """
+        Como run_in_executor, mas coalescendo chamadas concorrentes.
+        
+        Chamadas com a mesma chave enquanto a primeira ainda executa
+        aguardam o mesmo resultado, sem repetir captcha e download.
+        O trabalho não é cancelado se quem o iniciou desconectar.
+        """
+        return await self._single_flight.run(
+            key,
+            functools.partial(self.run_in_executor, func, *args, **kwargs),
+        )
+
+    @property
+    def sicar(self) -> Sicar:
+        """Cliente Sicar da thread atual (criado no primeiro uso)."""
+        sicar = getattr(self._local, "sicar", None)
+        if sicar is None:
+            # Por enquanto só suportamos Tesseract
+            sicar = Sicar(driver=Tesseract)
+            self._local.sicar = sicar
+        return sicar
+
+    def _resolver_captcha(self) -> str:
+        """
+        Baixa um captcha na sessão da thread atual e resolve via OCR.
+        
+        O download usa a sessão HTTP da thread (o captcha é vinculado
+        a ela); apenas o OCR vai para o pool de processos.
+        """
+        captcha = self.sicar._download_captcha()
+        pool = _get_captcha_pool()
+        try:
+            return pool.submit(_ocr_captcha, captcha).result()
+        except BrokenProcessPool:
+            _descartar_captcha_pool(pool)
+            raise
+
+    def _cache_path(self, state: str, polygon: str) -> Path:
+        """Caminho do shapefile de um estado no cache (mesmo nome do download)."""
+        state_enum = State[state.upper()]
+        polygon_enum = Polygon[polygon.upper()]
+        return self.cache_dir / f"{state_enum.value}_{polygon_enum.value}.zip"
+
+    def get_cached_polygon(self, state: str, polygon: str) -> Path | None:
+        """
+        Retorna o shapefile em cache, se existir e ainda estiver válido.
+        
+        Args:
+            state: Sigla do estado (ex: "SP")
+            polygon: Tipo de polígono (ex: "APPS", "AREA_PROPERTY")
+            
+        Returns:
+            Caminho do ZIP em cache ou None
+        """
+        path = self._cache_path(state, polygon)
+        try:
+            idade = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        return path if idade < self.cache_ttl_seconds else None
+
+    def iniciar_download_estado(self, state: str, polygon: str) -> asyncio.Event | None:
+        """
+        Registra o download de um estado ainda fora do cache.
+        
+        Apenas a primeira requisição baixa do SICAR (e grava o cache);
+        as concorrentes aguardam o Event e depois leem do disco.
+        Deve ser chamado a partir do event loop.
+        
+        Returns:
+            None se quem chamou deve baixar (e depois chamar
+            concluir_download_estado), ou o Event do download em andamento
+        """
+        key = (state, polygon)
+        em_andamento = self._downloads_estado.get(key)
+        if em_andamento is None:
+            self._downloads_estado[key] = asyncio.Event()
+        return em_andamento
+
+    def concluir_download_estado(self, state: str, polygon: str) -> None:
+        """Libera as requisições que aguardam o download (sucesso ou falha)."""
+        em_andamento = self._downloads_estado.pop((state, polygon), None)
+        if em_andamento is not None:
+            em_andamento.set()
+
+    def cache_polygon_stream(
+        self,
+        chunks: Iterator[bytes],
+        state: str,
+        polygon: str,
+    ) -> Iterator[bytes]:
+        """
+        Repassa os blocos do download gravando-os no cache em disco.
+        
+        O arquivo só é publicado (os.replace atômico) se o download
+        terminar; se o cliente desconectar, o parcial é descartado.
+        """
+        destino = self._cache_path(state, polygon)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        parcial = destino.with_name(f"{destino.name}.{uuid.uuid4().hex}.part")
+        
+        try:
+            with parcial.open("wb") as arquivo:
+                for chunk in chunks:
+                    arquivo.write(chunk)
+                    yield chunk
+            os.replace(parcial, destino)
+            logger.info("Shapefile armazenado em cache: %s", destino.name)
+        finally:
+            parcial.unlink(missing_ok=True)
+
     def download_polygon_as_bytes(
         self,
         state: str,
@@ -64,6 +293,37 @@ class SicarService:
         Raises:
             Exception: Se o download falhar
         """
+        chunks, filename, _ = self.stream_polygon(state, polygon)
+        file_bytes = b"".join(chunks)
+        
+        logger.info(f"Download streaming concluído: {filename} ({len(file_bytes)} bytes)")
+        return file_bytes, filename
+
+    def stream_polygon(
+        self,
+        state: str,
+        polygon: str,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Tuple[Iterator[bytes], str, int]:
+        """
+        Abre o download de um polígono do SICAR sem bufferizar o arquivo.
+        
+        Resolve o captcha (com retentativas) até obter uma resposta válida
+        e retorna um iterador sobre o corpo da resposta, que é fechada
+        ao final da iteração.
+        
+        Args:
+            state: Sigla do estado (ex: "SP")
+            polygon: Tipo de polígono (ex: "APPS", "AREA_PROPERTY")
+            chunk_size: Tamanho dos blocos entregues pelo iterador
+            
+        Returns:
+            Tuple com (iterador de bytes do ZIP, nome do arquivo,
+            tamanho em bytes informado pelo SICAR no Content-Length)
+            
+        Raises:
+            Exception: Se nenhuma tentativa obtiver resposta válida
+        """
         import httpx
         from urllib.parse import urlencode
         
@@ -78,19 +338,20 @@ class SicarService:
         last_error = None
         
         while retry_count < max_retries:
+            response = None
             try:
                 # Obter captcha
-                captcha = self.sicar._driver.get_captcha(self.sicar._download_captcha())
+                captcha = self._resolver_captcha()
                 
                 if len(captcha) != 5:
                     retry_count += 1
-                    logger.debug(f"[{retry_count:02d}] Captcha inválido (tamanho {len(captcha)}): '{captcha}'")
+                    logger.debug("[%02d] Captcha inválido (tamanho %d): '%s'", retry_count, len(captcha), captcha)
                     time.sleep(random.random() + random.random())
                     continue
                 
-                logger.info(f"[{retry_count + 1:02d}/{max_retries}] Tentando com captcha: {captcha}")
+                logger.info("[%02d/%d] Tentando com captcha: %s", retry_count + 1, max_retries, captcha)
                 
-                # Fazer download para bytes
+                # Abrir download (corpo é lido sob demanda)
                 query = urlencode({
                     "idEstado": state_enum.value, 
                     "tipoBase": polygon_enum.value, 
@@ -98,39 +359,35 @@ class SicarService:
                 })
                 
                 url = f"{self.sicar._DOWNLOAD_BASE}?{query}"
-                logger.debug(f"URL de download: {url}")
+                logger.debug("URL de download: %s", url)
                 
-                with self.sicar._session.stream("GET", url) as response:
-                    status_code = response.status_code
-                    content_type = response.headers.get("Content-Type", "")
-                    content_length = int(response.headers.get("Content-Length", 0))
-                    
-                    logger.debug(f"Response: status={status_code}, content_type={content_type}, length={content_length}")
-                    
-                    if status_code != httpx.codes.OK:
-                        raise Exception(f"HTTP {status_code}")
-                    
-                    if content_length == 0:
-                        raise Exception("Content-Length é 0 (captcha provavelmente incorreto)")
-                    
-                    if not content_type.startswith("application/zip"):
-                        raise Exception(f"Content-Type inválido: {content_type}")
-                    
-                    # Ler todos os bytes
-                    buffer = io.BytesIO()
-                    for chunk in response.iter_bytes():
-                        buffer.write(chunk)
-                    
-                    file_bytes = buffer.getvalue()
-                    filename = f"{state_enum.value}_{polygon_enum.value}.zip"
-                    
-                    logger.info(f"Download streaming concluído: {filename} ({len(file_bytes)} bytes)")
-                    return file_bytes, filename
+                session = self.sicar._session
+                response = session.send(session.build_request("GET", url), stream=True)
+                
+                status_code = response.status_code
+                content_type = response.headers.get("Content-Type", "")
+                content_length = int(response.headers.get("Content-Length", 0))
+                
+                logger.debug("Response: status=%s, content_type=%s, length=%d", status_code, content_type, content_length)
+                
+                if status_code != httpx.codes.OK:
+                    raise Exception(f"HTTP {status_code}")
+                
+                if content_length == 0:
+                    raise Exception("Content-Length é 0 (captcha provavelmente incorreto)")
+                
+                if not content_type.startswith("application/zip"):
+                    raise Exception(f"Content-Type inválido: {content_type}")
+                
+                filename = f"{state_enum.value}_{polygon_enum.value}.zip"
+                return _iterar_e_fechar(response, chunk_size), filename, content_length
                     
             except Exception as e:
+                if response is not None:
+                    response.close()
                 retry_count += 1
                 last_error = e
-                logger.warning(f"[{retry_count:02d}] Erro: {e}")
+                logger.warning("[%02d] Erro: %s", retry_count, e)
                 time.sleep(random.random() + random.random())
         
         raise Exception(f"Download falhou após {max_retries} tentativas: {last_error}")
@@ -171,15 +428,15 @@ class SicarService:
         while retry_count < max_retries:
             try:
                 # Obter captcha
-                captcha = self.sicar._driver.get_captcha(self.sicar._download_captcha())
+                captcha = self._resolver_captcha()
                 
                 if len(captcha) != 5:
                     retry_count += 1
-                    logger.debug(f"[{retry_count:02d}] Captcha inválido (tamanho {len(captcha)}): '{captcha}'")
+                    logger.debug("[%02d] Captcha inválido (tamanho %d): '%s'", retry_count, len(captcha), captcha)
                     time.sleep(random.random() + random.random())
                     continue
                 
-                logger.info(f"[{retry_count + 1:02d}/{max_retries}] Tentando com captcha: {captcha}")
+                logger.info("[%02d/%d] Tentando com captcha: %s", retry_count + 1, max_retries, captcha)
                 
                 # Fazer download
                 response = self.sicar._session.post(
@@ -194,16 +451,15 @@ class SicarService:
                 content_type = response.headers.get("Content-Type", "")
                 content_length = len(response.content)
                 
-                logger.debug(f"Response: status={status_code}, content_type={content_type}, length={content_length}")
+                logger.debug("Response: status=%s, content_type=%s, length=%d", status_code, content_type, content_length)
                 
                 if status_code != httpx.codes.OK:
                     raise Exception(f"HTTP {status_code}")
                 
                 # Verificar se resposta é base64
                 content = response.content
-                if response.text.startswith("data:application/zip;base64,"):
-                    base64_data = response.text.split(",", 1)[1]
-                    content = base64.b64decode(base64_data)
+                if content.startswith(_BASE64_ZIP_PREFIX):
+                    content = base64.b64decode(content[len(_BASE64_ZIP_PREFIX):])
                     logger.info(f"Resposta em base64 decodificada: {len(content)} bytes")
                 
                 # Verificar se é um arquivo válido
@@ -220,7 +476,7 @@ class SicarService:
             except Exception as e:
                 retry_count += 1
                 last_error = e
-                logger.warning(f"[{retry_count:02d}] Erro: {e}")
+                logger.warning("[%02d] Erro: %s", retry_count, e)
                 time.sleep(random.random() + random.random())
         
         raise Exception(f"Download CAR falhou após {max_retries} tentativas: {last_error}")
@@ -307,8 +563,9 @@ class SicarService:
         return processed_bytes, filename, resultado
 
 
-# Polígonos disponíveis para documentação
-AVAILABLE_POLYGONS = [
+# Polígonos disponíveis. Literal: os requests da API são validados no
+# núcleo do Pydantic (sem callback Python) e o OpenAPI expõe um enum
+PolygonType = Literal[
     "AREA_PROPERTY",      # Área do Imóvel
     "APPS",               # Áreas de Preservação Permanente
     "NATIVE_VEGETATION",  # Vegetação Nativa
@@ -321,8 +578,12 @@ AVAILABLE_POLYGONS = [
 ]
 
 # Estados disponíveis
-AVAILABLE_STATES = [
+StateCode = Literal[
     "AC", "AL", "AP", "AM", "BA", "CE", "DF", "ES", "GO",
     "MA", "MT", "MS", "MG", "PA", "PB", "PR", "PE", "PI",
     "RJ", "RN", "RS", "RO", "RR", "SC", "SP", "SE", "TO"
 ]
+
+# Listas para documentação, derivadas dos Literals (fonte única)
+AVAILABLE_POLYGONS: list[str] = list(get_args(PolygonType))
+AVAILABLE_STATES: list[str] = list(get_args(StateCode))
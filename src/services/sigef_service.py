@@ -5,8 +5,13 @@ Operações de negócio relacionadas ao SIGEF INCRA,
 como download de dados de parcelas.
 """
 
+import asyncio
+import time
+import uuid
 from pathlib import Path
 
+from src.core.cache import SingleFlight
+from src.core.config import get_settings
 from src.core.exceptions import SessionExpiredError
 from src.core.logging import get_logger
 from src.domain.entities import Parcela, Session, TipoExportacao
@@ -29,6 +34,8 @@ class SigefService:
         sigef_client: ISigefClient,
         session_repository: ISessionRepository,
         auth_service: AuthService | None = None,
+        downloads_dir: Path | None = None,
+        cache_ttl_seconds: float | None = None,
     ):
         """
         Inicializa serviço.
@@ -37,10 +44,80 @@ class SigefService:
             sigef_client: Cliente SIGEF
             session_repository: Repositório de sessões
             auth_service: Serviço de autenticação (para refresh automático)
+            downloads_dir: Diretório padrão dos downloads (reaproveitados)
+            cache_ttl_seconds: Validade dos downloads reaproveitados (0 desativa)
         """
+        settings = get_settings()
         self.sigef = sigef_client
         self.sessions = session_repository
         self.auth = auth_service
+        self.downloads_dir = downloads_dir or settings.downloads_dir
+        self.cache_ttl_seconds = (
+            settings.sigef_download_cache_ttl_seconds
+            if cache_ttl_seconds is None
+            else cache_ttl_seconds
+        )
+        # Pedidos simultâneos do mesmo arquivo aguardam um único download
+        self._single_flight = SingleFlight()
+    
+    async def _download_em_cache(self, codigo: str, sufixo: str) -> Path | None:
+        """
+        Retorna download recente da parcela no diretório padrão.
+        
+        Os arquivos têm nome determinístico ({codigo}_{sufixo}) e são
+        publicados atomicamente pelo cliente; dentro da validade,
+        evitam nova sessão e novo download no SIGEF.
+        """
+        if self.cache_ttl_seconds <= 0:
+            return None
+        try:
+            codigo = str(uuid.UUID(codigo.strip()))
+        except ValueError:
+            return None  # inválido: o cliente SIGEF reporta o erro
+        
+        path = self.downloads_dir / f"{codigo}_{sufixo}"
+        try:
+            # stat em thread: disco lento/NFS não bloqueia o event loop
+            st = await asyncio.to_thread(path.stat)
+        except OSError:
+            return None
+        
+        idade = time.time() - st.st_mtime
+        
+        return path if idade < self.cache_ttl_seconds else None
+    
+    async def _csvs_em_cache(self, codigo: str) -> dict[str, Path] | None:
+        """Retorna todos os CSVs da parcela em cache, ou None se faltar algum."""
+        tipos = list(TipoExportacao)
+        cached = await asyncio.gather(*(
+            self._download_em_cache(codigo, f"{tipo.value}.csv") for tipo in tipos
+        ))
+        caminhos = [path for path in cached if path is not None]
+        if len(caminhos) != len(tipos):
+            return None
+        return {tipo.value: path for tipo, path in zip(tipos, caminhos, strict=True)}
+    
+    async def get_cached_files(
+        self,
+        codigo: str,
+    ) -> tuple[dict[str, Path], Path | None] | None:
+        """
+        Retorna os arquivos da parcela já baixados, sem acessar o SIGEF.
+        
+        Args:
+            codigo: Código SIGEF da parcela.
+        
+        Returns:
+            Tupla (CSVs por tipo, memorial ou None), ou None se algum
+            CSV não estiver em cache.
+        """
+        csvs, memorial = await asyncio.gather(
+            self._csvs_em_cache(codigo),
+            self._download_em_cache(codigo, "memorial.pdf"),
+        )
+        if csvs is None:
+            return None
+        return csvs, memorial
     
     async def _get_valid_session(self, force_reauth: bool = False) -> Session:
         """Obtém sessão válida ou lança exceção."""
@@ -158,6 +235,12 @@ class SigefService:
         # Converte destino se string
         destino_path = Path(destino) if destino else None
         
+        if destino_path is None:
+            cached = await self._download_em_cache(codigo, f"{tipo.value}.csv")
+            if cached is not None:
+                logger.info("CSV reaproveitado do cache", codigo=codigo, tipo=tipo.value)
+                return cached
+        
         async def _download(session):
             return await self.sigef.download_csv(
                 codigo=codigo,
@@ -166,6 +249,11 @@ class SigefService:
                 destino=destino_path,
             )
         
+        if destino_path is None:
+            return await self._single_flight.run(
+                ("csv", codigo.strip().lower(), tipo.value),
+                lambda: self._execute_with_reauth(_download),
+            )
         return await self._execute_with_reauth(_download)
     
     async def download_all_csvs(
@@ -185,6 +273,12 @@ class SigefService:
         """
         destino_path = Path(destino_dir) if destino_dir else None
         
+        if destino_path is None:
+            cached = await self._csvs_em_cache(codigo)
+            if cached is not None:
+                logger.info("CSVs reaproveitados do cache", codigo=codigo)
+                return cached
+        
         async def _download_all(session):
             results = await self.sigef.download_all_csvs(
                 codigo=codigo,
@@ -194,6 +288,11 @@ class SigefService:
             # Converte enum keys para strings
             return {tipo.value: path for tipo, path in results.items()}
         
+        if destino_path is None:
+            return await self._single_flight.run(
+                ("csvs", codigo.strip().lower()),
+                lambda: self._execute_with_reauth(_download_all),
+            )
         return await self._execute_with_reauth(_download_all)
     
     async def download_batch(
@@ -213,46 +312,54 @@ class SigefService:
         Returns:
             Dicionário codigo -> {tipo -> path}.
         """
-        tipos = tipos or list(TipoExportacao)
+        # Códigos/tipos repetidos baixariam o mesmo arquivo de novo
+        # (dict.fromkeys remove duplicatas preservando a ordem)
+        codigos = list(dict.fromkeys(codigos))
+        tipos = list(dict.fromkeys(tipos)) if tipos else list(TipoExportacao)
         destino_path = Path(destino_dir) if destino_dir else None
         
-        results: dict[str, dict[str, Path]] = {}
+        # Parcelas em paralelo, limitadas para não saturar o SIGEF
+        limite = asyncio.Semaphore(get_settings().sigef_max_concurrency)
         
-        for codigo in codigos:
-            logger.info(
-                "Processando parcela",
-                codigo=codigo,
-                total=len(codigos),
-                atual=len(results) + 1,
-            )
-            
-            try:
-                parcela_results = {}
+        async def _baixar_parcela(codigo: str) -> dict[str, Path]:
+            async with limite:
+                logger.info(
+                    "Processando parcela",
+                    codigo=codigo,
+                    total=len(codigos),
+                )
                 
-                for tipo in tipos:
-                    path = await self.download_csv(
+                try:
+                    parcela_results = {}
+                    
+                    for tipo in tipos:
+                        path = await self.download_csv(
+                            codigo=codigo,
+                            tipo=tipo,
+                            destino=destino_path / f"{codigo}_{tipo.value}.csv" if destino_path else None,
+                        )
+                        parcela_results[tipo.value] = path
+                    
+                    return parcela_results
+                    
+                except Exception as e:
+                    logger.error(
+                        "Erro ao processar parcela",
                         codigo=codigo,
-                        tipo=tipo,
-                        destino=destino_path / f"{codigo}_{tipo.value}.csv" if destino_path else None,
+                        error=str(e),
                     )
-                    parcela_results[tipo.value] = path
-                
-                results[codigo] = parcela_results
-                
-            except Exception as e:
-                logger.error(
-                    "Erro ao processar parcela",
-                    codigo=codigo,
-                    error=str(e),
-                )
-                # Continua com próximas parcelas
-                results[codigo] = {"error": str(e)}  # type: ignore
+                    # Continua com as demais parcelas
+                    return {"error": str(e)}  # type: ignore
+        
+        parcelas = await asyncio.gather(*(_baixar_parcela(codigo) for codigo in codigos))
+        results: dict[str, dict[str, Path]] = dict(zip(codigos, parcelas, strict=True))
         
+        falhas = sum(1 for r in results.values() if "error" in r)
         logger.info(
             "Batch concluído",
             total=len(codigos),
-            sucesso=sum(1 for r in results.values() if "error" not in r),
-            falhas=sum(1 for r in results.values() if "error" in r),
+            sucesso=len(results) - falhas,
+            falhas=falhas,
         )
         
         return results
@@ -274,6 +381,12 @@ class SigefService:
         """
         destino_path = Path(destino) if destino else None
         
+        if destino_path is None:
+            cached = await self._download_em_cache(codigo, "memorial.pdf")
+            if cached is not None:
+                logger.info("Memorial reaproveitado do cache", codigo=codigo)
+                return cached
+        
         async def _download(session):
             return await self.sigef.download_memorial(
                 codigo=codigo,
@@ -281,6 +394,11 @@ class SigefService:
                 destino=destino_path,
             )
         
+        if destino_path is None:
+            return await self._single_flight.run(
+                ("memorial", codigo.strip().lower()),
+                lambda: self._execute_with_reauth(_download),
+            )
         return await self._execute_with_reauth(_download)
     
     async def open_parcela_browser(self, codigo: str) -> None: